@@ -22,8 +22,17 @@ class AvatarWidget(QWidget):
         self.repaint()
 
     def set_state(self, new_state):
+        if new_state == self.state: return
         self.state = new_state
-        self.repaint()
+        self.update()
+
+    def use_frame_clock(self, external):
+        # Turbo duels drive the animation from the screen's frame clock.
+        if external: self.timer.stop()
+        else: self.timer.start(50)
+
+    def advance_frame(self):
+        self._animate()
 
     def _animate(self):
         if self.state == "THINKING":
@@ -57,6 +66,19 @@ class AvatarWidget(QWidget):
             eye_y, lx, rx = 35, 25, 45
             mouth_y = 55
 
+        elif self.strategy == "PROBING":
+            # Pentagon — tests each option before committing
+            path = QPainterPath()
+            path.moveTo(40, 8)
+            path.lineTo(72, 32)
+            path.lineTo(60, 72)
+            path.lineTo(20, 72)
+            path.lineTo(8,  32)
+            path.closeSubpath()
+            qp.drawPath(path)
+            eye_y, lx, rx = 40, 28, 52
+            mouth_y = 58
+
         elif self.strategy == "DIVIDE_CONQUER":
             # Triangle — divide
             path = QPainterPath()
@@ -86,6 +108,52 @@ class AvatarWidget(QWidget):
             eye_y, lx, rx = 38, 28, 44
             mouth_y = 56
 
+        elif self.strategy == "ADVERSARIAL":
+            # Hexagon — looks ahead at both players
+            path = QPainterPath()
+            path.moveTo(24, 10)
+            path.lineTo(56, 10)
+            path.lineTo(72, 40)
+            path.lineTo(56, 70)
+            path.lineTo(24, 70)
+            path.lineTo(8,  40)
+            path.closeSubpath()
+            qp.drawPath(path)
+            eye_y, lx, rx = 35, 28, 52
+            mouth_y = 55
+
+        elif self.strategy == "PORTFOLIO":
+            # Four-point star — several searches racing outward
+            path = QPainterPath()
+            path.moveTo(40, 4)
+            path.lineTo(52, 28)
+            path.lineTo(76, 40)
+            path.lineTo(52, 52)
+            path.lineTo(40, 76)
+            path.lineTo(28, 52)
+            path.lineTo(4,  40)
+            path.lineTo(28, 28)
+            path.closeSubpath()
+            qp.drawPath(path)
+            eye_y, lx, rx = 36, 33, 47
+            mouth_y = 50
+
+        elif self.strategy == "SAT":
+            # Octagon — a stop sign for every conflict it learns from
+            path = QPainterPath()
+            path.moveTo(28, 8)
+            path.lineTo(52, 8)
+            path.lineTo(72, 28)
+            path.lineTo(72, 52)
+            path.lineTo(52, 72)
+            path.lineTo(28, 72)
+            path.lineTo(8,  52)
+            path.lineTo(8,  28)
+            path.closeSubpath()
+            qp.drawPath(path)
+            eye_y, lx, rx = 36, 28, 52
+            mouth_y = 55
+
         else:
             qp.drawRect(10, 10, 60, 60)
             eye_y, lx, rx = 35, 25, 45
@@ -0,0 +1,214 @@
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from board import DominosaBoard
+from solver import SolverEngine, STRATEGIES
+
+Matrix = List[List[int]]
+
+# Puzzle-collection game IDs are "N:description" where N may carry option
+# letters ("6dt") and the description lists the (N+1) x (N+2) grid row by
+# row, one digit per cell and numbers above 9 in brackets ("[12]").
+_GAME_ID = re.compile(r"(\d+)[a-z]*:((?:\d|\[\d+\])*)\Z")
+_TOKEN = re.compile(r"\[(\d+)\]|(\d)")
+WINDOW_PER_WORKER = 4
+
+
+def check_matrix(matrix: Matrix, n: Optional[int] = None) -> int:
+    if n is None:
+        n = len(matrix) - 1
+    if n < 1 or len(matrix) != n + 1:
+        raise ValueError(f"A Double-{n} board needs {n + 1} rows, got {len(matrix)}")
+    counts: Counter = Counter()
+    for row in matrix:
+        if len(row) != n + 2:
+            raise ValueError(f"A Double-{n} board needs rows of {n + 2}, got {len(row)}")
+        counts.update(row)
+    for value, count in counts.items():
+        if not 0 <= value <= n:
+            raise ValueError(f"Value {value} is outside 0..{n}")
+        if count != n + 2:
+            raise ValueError(f"Value {value} appears {count} times, expected {n + 2}")
+    return n
+
+
+def parse_game_id(text: str) -> Matrix:
+    match = _GAME_ID.match(text.strip())
+    if match is None:
+        raise ValueError("Not a Dominosa game ID (expected 'N:digits')")
+    n, cols = int(match.group(1)), int(match.group(1)) + 2
+    values = [int(big or small) for big, small in _TOKEN.findall(match.group(2))]
+    if len(values) != (n + 1) * cols:
+        raise ValueError(f"A Double-{n} game ID needs {(n + 1) * cols} cells, got {len(values)}")
+    matrix = [values[r * cols:(r + 1) * cols] for r in range(n + 1)]
+    check_matrix(matrix, n)
+    return matrix
+
+
+def format_game_id(matrix: Matrix) -> str:
+    n = len(matrix) - 1
+    return f"{n}:" + "".join(str(v) if v < 10 else f"[{v}]" for row in matrix for v in row)
+
+
+def parse_grid_row(line: str) -> List[int]:
+    # Whitespace-separated numbers, or one digit per cell when unspaced.
+    tokens = line.split()
+    if len(tokens) == 1:
+        tokens = list(tokens[0])
+    try:
+        return [int(t) for t in tokens]
+    except ValueError:
+        raise ValueError(f"Bad grid row '{line.strip()}'") from None
+
+
+def format_grid(matrix: Matrix) -> str:
+    width = len(str(len(matrix) - 1))
+    return "\n".join(" ".join(f"{v:>{width}}" for v in row) for row in matrix)
+
+
+def read_boards(lines: Iterable[str]) -> Iterator[Tuple[int, Matrix]]:
+    # Yields (first line number, matrix) one board at a time. Game IDs take a
+    # line each; text grids end at a blank line or once they have N+1 rows.
+    rows: Matrix = []
+    start = 0
+    for line_no, line in enumerate(lines, 1):
+        text = line.strip()
+        if text.startswith("#"):
+            continue
+        try:
+            if ":" in text:
+                if rows:
+                    raise ValueError("Grid ends before its last row")
+                yield line_no, parse_game_id(text)
+                continue
+            if not text:
+                if rows:
+                    raise ValueError("Grid ends before its last row")
+                continue
+            if not rows:
+                start = line_no
+            rows.append(parse_grid_row(text))
+            if len(rows) == len(rows[0]) - 1:
+                check_matrix(rows)
+                yield start, rows
+                rows = []
+        except ValueError as exc:
+            raise ValueError(f"line {line_no}: {exc}") from None
+    if rows:
+        raise ValueError(f"line {start}: grid ends before its last row")
+
+
+def open_text(path: str, mode: str = "r") -> IO[str]:
+    if path == "-":
+        return sys.stdin if "r" in mode else sys.stdout
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t")
+    return open(path, mode)
+
+
+def iter_file(path: str) -> Iterator[Tuple[int, Matrix]]:
+    with open_text(path) as fh:
+        yield from read_boards(fh)
+
+
+def write_boards(out: IO[str], boards: Iterable[Tuple[int, Matrix]], fmt: str = "id") -> int:
+    written = 0
+    for _, matrix in boards:
+        if fmt == "id":
+            out.write(format_game_id(matrix) + "\n")
+        else:
+            out.write(("\n" if written else "") + format_grid(matrix) + "\n")
+        written += 1
+    return written
+
+
+def solve_matrix(matrix: Matrix, strategy: str = "DYNAMIC_PROGRAMMING") -> Dict:
+    board = DominosaBoard(matrix)
+    engine = SolverEngine(board.fork())
+    start = time.perf_counter()
+    nodes, reason = 0, "Solved"
+    while board.get_progress() < 1.0:
+        move, reason = engine.solve_next_step(strategy, board.snapshot())
+        nodes += engine.stats.nodes_expanded
+        if move is None:
+            break
+        board.confirm_edge(board.edges[move.index], 1)
+    solved = board.get_progress() >= 1.0
+    return {"n": len(matrix) - 1, "solved": solved, "moves": len(board.placements), "nodes": nodes,
+            "ms": round((time.perf_counter() - start) * 1000, 3), "reason": "Solved" if solved else reason}
+
+
+def solve_stream(boards: Iterable[Tuple[int, Matrix]], strategy: str = "DYNAMIC_PROGRAMMING",
+                 workers: Optional[int] = None) -> Iterator[Tuple[int, Dict]]:
+    # Results come back in input order. Only a few boards per worker are in
+    # flight, so a corpus of any size is read as fast as it is solved.
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        window = deque()
+        for line_no, matrix in boards:
+            window.append((line_no, pool.submit(solve_matrix, matrix, strategy)))
+            if len(window) >= workers * WINDOW_PER_WORKER:
+                line_no, future = window.popleft()
+                yield line_no, future.result()
+        while window:
+            line_no, future = window.popleft()
+            yield line_no, future.result()
+
+
+def _convert(args):
+    out = open_text(args.out, "w")
+    try:
+        count = write_boards(out, iter_file(args.input), args.to)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    print(f"{count} boards written", file=sys.stderr)
+
+
+def _solve(args):
+    out = open_text(args.json, "w") if args.json else None
+    total = solved = 0
+    elapsed = 0.0
+    try:
+        for line_no, result in solve_stream(iter_file(args.input), args.strategy, args.workers):
+            total += 1
+            solved += result["solved"]
+            elapsed += result["ms"]
+            if out is not None:
+                out.write(json.dumps({"line": line_no, **result}) + "\n")
+            if not result["solved"]:
+                print(f"line {line_no}: Double-{result['n']} not solved ({result['reason']})", file=sys.stderr)
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+    print(f"{solved}/{total} boards solved, {elapsed:.1f} ms solver time", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Read, convert and batch-solve Dominosa game IDs and text grids")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert = commands.add_parser("convert", help="rewrite boards as game IDs or text grids")
+    convert.add_argument("input", help="file of game IDs and/or grids, .gz or '-' for stdin")
+    convert.add_argument("--to", choices=("id", "grid"), default="id")
+    convert.add_argument("--out", default="-")
+    solve = commands.add_parser("solve", help="solve every board on a process pool")
+    solve.add_argument("input", help="file of game IDs and/or grids, .gz or '-' for stdin")
+    solve.add_argument("--strategy", choices=STRATEGIES, default="DYNAMIC_PROGRAMMING")
+    solve.add_argument("--workers", type=int, default=None)
+    solve.add_argument("--json", help="write one JSON result per board to this file ('-' for stdout)")
+    args = parser.parse_args()
+    try:
+        if args.command == "convert":
+            _convert(args)
+        else:
+            _solve(args)
+    except ValueError as exc:
+        sys.exit(f"{args.input}: {exc}")
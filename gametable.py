@@ -0,0 +1,64 @@
+import threading
+from itertools import islice
+from typing import Dict, Iterable, Optional, Tuple
+
+
+class GameTable:
+    # Tables shared by every engine playing on one board. Single dict reads
+    # and writes are atomic, so readers need no lock; the proven line is
+    # swapped as a whole under the lock.
+    def __init__(self):
+        self.dp_memo: Dict[int, bool] = {}
+        self.proven_moves: Dict[int, int] = {}
+        self.dc_memo: Dict[Tuple[int, int], Dict[int, int]] = {}
+        self.game_tt: Dict[int, Tuple[int, int, int, int]] = {}
+        self.lock = threading.Lock()
+        self.line: Tuple[int, ...] = ()
+        self.line_set: frozenset = frozenset()
+        # Leading entries of dp_memo / proven_moves already handed to a store.
+        self.saved_verdicts = 0
+        self.saved_moves = 0
+
+    def set_line(self, edges: Iterable[int]):
+        edges = tuple(edges)
+        with self.lock:
+            self.line, self.line_set = edges, frozenset(edges)
+
+    def entries(self) -> int:
+        return len(self.dp_memo) + len(self.proven_moves) + len(self.dc_memo) + len(self.game_tt)
+
+    def evict(self, fraction: float) -> int:
+        # Drops the oldest entries of the memos. Proven moves are kept: there
+        # is one per solved state and they make up the proof lines. Tables are
+        # rebuilt rather than popped from so their storage actually shrinks.
+        dropped = 0
+        for memo in (self.dp_memo, self.dc_memo, self.game_tt):
+            cut = int(len(memo) * fraction)
+            if not cut:
+                continue
+            survivors = dict(islice(memo.items(), cut, None))
+            memo.clear()
+            memo.update(survivors)
+            dropped += cut
+            if memo is self.dp_memo:
+                self.saved_verdicts = max(0, self.saved_verdicts - cut)
+        return dropped
+
+    def take_unsaved(self) -> Tuple[Dict[int, bool], Dict[int, int]]:
+        # Memos only grow at the end and evict from the front, so everything
+        # past the saved marks is new since the last call.
+        verdicts, moves = self.dp_memo.copy(), self.proven_moves.copy()
+        fresh = (dict(islice(verdicts.items(), self.saved_verdicts, None)),
+                 dict(islice(moves.items(), self.saved_moves, None)))
+        self.saved_verdicts, self.saved_moves = len(verdicts), len(moves)
+        return fresh
+
+    def next_on_line(self, placed: Iterable[int]) -> Optional[int]:
+        line, line_set = self.line, self.line_set
+        placed = set(placed)
+        if not line or not placed <= line_set:
+            return None
+        for idx in line:
+            if idx not in placed:
+                return idx
+        return None
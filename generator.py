@@ -0,0 +1,138 @@
+import argparse
+import json
+import multiprocessing
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, Executor, ProcessPoolExecutor, wait
+from typing import List, Optional, Tuple
+
+from board import DominosaBoard
+from profiling import profiled
+from solver import count_solutions
+
+ATTEMPTS_PER_JOB = 16
+
+
+def domino_set(n: int) -> List[Tuple[int, int]]:
+    return [(i, j) for i in range(n + 1) for j in range(i, n + 1)]
+
+
+def random_tiling(n: int, rng: random.Random) -> Optional[List[List[int]]]:
+    rows, cols = n + 1, n + 2
+    grid = [[-1] * cols for _ in range(rows)]
+    d_list = domino_set(n)
+    rng.shuffle(d_list)
+
+    def place(idx):
+        if idx == len(d_list): return True
+        r, c = -1, -1
+        for i in range(rows):
+            for j in range(cols):
+                if grid[i][j] == -1:
+                    r, c = i, j
+                    break
+            if r != -1: break
+
+        d = d_list[idx]
+        placements = [(0, 1), (1, 0)]
+        rng.shuffle(placements)
+        for dr, dc in placements:
+            nr, nc = r + dr, c + dc
+            if nr < rows and nc < cols and grid[nr][nc] == -1:
+                v1, v2 = d if rng.random() > 0.5 else (d[1], d[0])
+                grid[r][c] = v1
+                grid[nr][nc] = v2
+                if place(idx + 1): return True
+                grid[r][c] = -1
+                grid[nr][nc] = -1
+        return False
+
+    return grid if place(0) else None
+
+
+def has_unique_solution(grid: List[List[int]]) -> bool:
+    return count_solutions(DominosaBoard(grid), limit=2) == 1
+
+
+@profiled("build_valid_matrix", detail=lambda n, *a, **k: f"double{n}")
+def build_valid_matrix(n: int, rng: Optional[random.Random] = None) -> List[List[int]]:
+    rng = rng or random.Random()
+    while True:
+        grid = random_tiling(n, rng)
+        if grid is not None and has_unique_solution(grid):
+            return grid
+
+
+def _search_unique(n: int, seed: int, attempts: int) -> Tuple[int, Optional[List[List[int]]]]:
+    # Same draw sequence as build_valid_matrix(n, Random(seed)), cut off after
+    # `attempts` tilings, so a hit can be regenerated from its seed alone.
+    rng = random.Random(seed)
+    for _ in range(attempts):
+        grid = random_tiling(n, rng)
+        if grid is not None and has_unique_solution(grid):
+            return seed, grid
+    return seed, None
+
+
+class ParallelGenerator:
+    def __init__(self, workers: Optional[int] = None, executor: Optional[Executor] = None,
+                 attempts_per_job: int = ATTEMPTS_PER_JOB):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.attempts_per_job = attempts_per_job
+
+    def batch(self, n: int, count: int, seed: Optional[int] = None) -> List[Tuple[int, List[List[int]]]]:
+        next_seed = random.randrange(1 << 31) if seed is None else seed
+        found: List[Tuple[int, List[List[int]]]] = []
+        pending = set()
+
+        # Keep every worker busy with small jobs; once enough boards are in,
+        # queued jobs are dropped and running ones are at most a few tilings long.
+        try:
+            while len(found) < count:
+                while len(pending) < 2 * self.workers:
+                    pending.add(self.executor.submit(_search_unique, n, next_seed, self.attempts_per_job))
+                    next_seed += 1
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in sorted(done, key=lambda f: f.result()[0]):
+                    job_seed, grid = future.result()
+                    if grid is not None and len(found) < count:
+                        found.append((job_seed, grid))
+        finally:
+            for future in pending:
+                future.cancel()
+        return found
+
+    def generate(self, n: int, seed: Optional[int] = None) -> Tuple[int, List[List[int]]]:
+        return self.batch(n, 1, seed)[0]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def build_valid_matrices(n: int, count: int, seed: Optional[int] = None,
+                         workers: Optional[int] = None) -> List[Tuple[int, List[List[int]]]]:
+    generator = ParallelGenerator(workers)
+    try:
+        return generator.batch(n, count, seed)
+    finally:
+        generator.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate unique-solution Dominosa boards on a process pool")
+    parser.add_argument("--size", type=int, default=6, help="Double-N board size")
+    parser.add_argument("--count", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="write the boards and their seeds to this JSON file")
+    args = parser.parse_args()
+
+    boards = build_valid_matrices(args.size, args.count, args.seed, args.workers)
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump([{"seed": seed, "matrix": grid} for seed, grid in boards], fh)
+    for seed, grid in boards:
+        print(f"seed {seed}")
+        print("\n".join(" ".join(str(v) for v in row) for row in grid))
@@ -0,0 +1,190 @@
+import argparse
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from board import DominosaBoard
+from generator import build_valid_matrix
+from solver import SolverEngine
+
+LADDER = ("GREEDY", "PROBING", "DYNAMIC_PROGRAMMING")
+BANDS = ("EASY", "MEDIUM", "HARD", "EXPERT")
+STEP_WEIGHTS = (1, 5, 25)
+HARD_SCORE = 4.0
+# Sampled boards up to Double-8 always fell to probing, so EXPERT (a search
+# step) is only offered from here up unless the bank already holds some.
+EXPERT_MIN_SIZE = 9
+DEFAULT_BANK = "board_bank.json"
+BANK_VERSION = 1
+
+
+@dataclass
+class GradedBoard:
+    matrix: List[List[int]]
+    size: int
+    seed: int
+    score: float
+    band: str
+    greedy_steps: int
+    probing_steps: int
+    search_steps: int
+    probes: int
+    search_nodes: int
+    max_depth: int
+
+
+def band_for(probing_steps: int, search_steps: int, score: float) -> str:
+    if search_steps:
+        return "EXPERT"
+    if probing_steps:
+        return "HARD" if score >= HARD_SCORE else "MEDIUM"
+    return "EASY"
+
+
+def reachable_bands(size: int, bank: Optional['BoardBank'] = None) -> Tuple[str, ...]:
+    return tuple(b for b in BANDS if b != "EXPERT" or size >= EXPERT_MIN_SIZE
+                 or (bank is not None and bank.count(size, b)))
+
+
+def grade(matrix: List[List[int]], seed: int = -1) -> GradedBoard:
+    board = DominosaBoard(matrix)
+    engine = SolverEngine(board.fork())
+    steps = [0] * len(LADDER)
+    probes = search_nodes = max_depth = 0
+
+    while board.get_progress() < 1.0:
+        for level, strategy in enumerate(LADDER):
+            move, reason = engine.solve_next_step(strategy, board.snapshot())
+            if strategy == "PROBING":
+                probes += engine.stats.memo_misses
+            elif level == len(LADDER) - 1:
+                search_nodes += engine.stats.nodes_expanded
+                max_depth = max(max_depth, engine.stats.max_depth)
+            if move is not None:
+                break
+        if move is None:
+            raise ValueError(f"Board cannot be graded: {reason}")
+        steps[level] += 1
+        board.confirm_edge(board.edges[move.index], 1)
+
+    # Every forced step costs something; harder rungs, probes and search nodes dominate.
+    effort = sum(w * s for w, s in zip(STEP_WEIGHTS, steps)) + probes + search_nodes
+    score = round(effort / board.total_dominoes, 3)
+    return GradedBoard(matrix, len(matrix) - 1, seed, score, band_for(steps[1], steps[2], score),
+                       steps[0], steps[1], steps[2], probes, search_nodes, max_depth)
+
+
+def _generate_and_grade(size: int, seed: int) -> GradedBoard:
+    return grade(build_valid_matrix(size, random.Random(seed)), seed)
+
+
+class BoardBank:
+    def __init__(self):
+        self.index: Dict[Tuple[int, str], List[GradedBoard]] = {}
+        self.seen = set()
+
+    def __len__(self) -> int:
+        return sum(len(v) for v in self.index.values())
+
+    def add(self, entry: GradedBoard) -> bool:
+        key = tuple(tuple(row) for row in entry.matrix)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.index.setdefault((entry.size, entry.band), []).append(entry)
+        return True
+
+    def count(self, size: int, band: str) -> int:
+        return len(self.index.get((size, band), ()))
+
+    def pick(self, size: int, band: str, rng: Optional[random.Random] = None) -> Optional[GradedBoard]:
+        entries = self.index.get((size, band))
+        if not entries:
+            return None
+        return (rng or random).choice(entries)
+
+    def save(self, path: str):
+        tmp = path + ".tmp"
+        with open(tmp, "w") as fh:
+            json.dump({"version": BANK_VERSION,
+                       "boards": [asdict(e) for entries in self.index.values() for e in entries]}, fh)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'BoardBank':
+        bank = cls()
+        if not os.path.exists(path):
+            return bank
+        with open(path) as fh:
+            data = json.load(fh)
+        if data.get("version") != BANK_VERSION:
+            raise ValueError(f"Unsupported board bank version {data.get('version')}")
+        for entry in data["boards"]:
+            bank.add(GradedBoard(**entry))
+        return bank
+
+
+def fill_bank(bank: BoardBank, sizes: Iterable[int], per_band: int, bands: Iterable[str] = BANDS,
+              seed: int = 0, workers: Optional[int] = None, max_boards: int = 2000,
+              batch: int = 64) -> BoardBank:
+    bands = list(bands)
+    workers = workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for size in sizes:
+            next_seed = seed + size * 1000003
+            generated = 0
+            while generated < max_boards and any(bank.count(size, b) < per_band for b in bands):
+                seeds = range(next_seed, next_seed + batch)
+                next_seed += batch
+                generated += batch
+                for entry in pool.map(_generate_and_grade, [size] * batch, seeds,
+                                      chunksize=max(1, batch // (workers * 4))):
+                    if entry.band in bands and bank.count(size, entry.band) < per_band:
+                        bank.add(entry)
+    return bank
+
+
+def select_board(bank: BoardBank, size: int, band: str, rng: Optional[random.Random] = None,
+                 attempts: int = 50) -> GradedBoard:
+    entry = bank.pick(size, band, rng)
+    if entry is not None:
+        return entry
+
+    rng = rng or random.Random()
+    closest = None
+    for _ in range(attempts):
+        seed = rng.randrange(1 << 30)
+        entry = _generate_and_grade(size, seed)
+        bank.add(entry)
+        if entry.band == band:
+            return entry
+        if closest is None or abs(BANDS.index(entry.band) - BANDS.index(band)) < \
+                abs(BANDS.index(closest.band) - BANDS.index(band)):
+            closest = entry
+    return closest
+
+
+def _print_bank(bank: BoardBank, sizes: Iterable[int]):
+    print(f"{'SIZE':<10}" + "".join(f"{b:>9}" for b in BANDS))
+    for size in sizes:
+        print(f"{'Double-' + str(size):<10}" + "".join(f"{bank.count(size, b):>9}" for b in BANDS))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate and grade Dominosa boards into a difficulty bank")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[3, 4, 5, 6])
+    parser.add_argument("--per-band", type=int, default=20, help="boards to keep per size and band")
+    parser.add_argument("--bands", nargs="+", default=list(BANDS), choices=BANDS)
+    parser.add_argument("--max-boards", type=int, default=2000, help="generation cap per size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--bank", default=DEFAULT_BANK)
+    args = parser.parse_args()
+
+    bank = BoardBank.load(args.bank)
+    fill_bank(bank, args.sizes, args.per_band, args.bands, args.seed, args.workers, args.max_boards)
+    bank.save(args.bank)
+    _print_bank(bank, args.sizes)
@@ -1,13 +1,20 @@
+import random
 import sys
 import time
-import random
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
-                             QPushButton, QLabel, QStackedWidget, QComboBox, QFrame, QSizePolicy)
+                             QPushButton, QLabel, QStackedWidget, QComboBox, QFrame, QSizePolicy,
+                             QScrollArea, QCheckBox)
 from PyQt6.QtCore import Qt, QThread, pyqtSignal, QTimer, QRectF
 from PyQt6.QtGui import QColor, QPainter, QFont, QPen, QBrush
 
-from board import DominosaBoard
-from solver import SolverEngine
+import profiling
+import ttstore
+from board import DominosaBoard, winner_when_stuck
+from gametable import GameTable
+from generator import build_valid_matrix
+from grading import DEFAULT_BANK, BoardBank, reachable_bands, select_board
+from records import HUMAN, GameRecorder, new_record_path
+from solver import SolverEngine, STRATEGIES, count_solutions
 from avatars import AvatarWidget
 from structures import BondState
 
@@ -21,8 +28,6 @@ GRID_HARD = [
     [3, 2, 4, 5, 6, 0, 0, 5]
 ]
 
-STRATEGIES = ["GREEDY", "DIVIDE_CONQUER", "DYNAMIC_PROGRAMMING", "BACKTRACKING"]
-
 STYLES = """
     QMainWindow { background-color: #FAFAFA; }
     QWidget { background-color: #FAFAFA; color: #111; font-family: 'Segoe UI', sans-serif; }
@@ -50,22 +55,96 @@ STYLES = """
 """
 
 class StrategyWorker(QThread):
-    finished = pyqtSignal(object, str, int)
+    finished = pyqtSignal(object, str, object)
     
-    def __init__(self, engine, strategy):
+    def __init__(self, engine, strategy, snapshot):
         super().__init__()
         self.engine = engine
         self.strategy = strategy
+        self.snapshot = snapshot
         self._is_running = True
         
     def run(self):
         time.sleep(0.5)
         if self._is_running:
-            move, reason = self.engine.solve_next_step(self.strategy)
-            self.finished.emit(move, reason, self.engine.nodes_visited)
+            move, reason = self.engine.solve_next_step(self.strategy, self.snapshot)
+            self.finished.emit(move, reason, self.engine.stats)
+
+    def stop(self):
+        self._is_running = False
+
+class SolutionStreamWorker(QThread):
+    step = pyqtSignal(object, str, object)
+    done = pyqtSignal(str)
+
+    def __init__(self, engine, strategy, snapshot):
+        super().__init__()
+        self.engine = engine
+        self.strategy = strategy
+        self.snapshot = snapshot
+
+    def run(self):
+        for move, reason, stats in self.engine.iter_solution(self.strategy, self.snapshot):
+            self.step.emit(move, reason, stats)
+        self.done.emit(self.engine.stats.reason)
+
+    def stop(self):
+        self.engine.is_cancelled = True
+
+class BoardSelectWorker(QThread):
+    ready = pyqtSignal(object, int, object)
+
+    def __init__(self, bank, size, band):
+        super().__init__()
+        self.bank = bank
+        self.size = size
+        self.band = band
+
+    def run(self):
+        # Grading a fresh board can take seconds when the bank has none in
+        # the requested band, so selection never runs on the GUI thread.
+        if self.band == "ANY":
+            seed = random.randrange(1 << 31)
+            self.ready.emit(build_valid_matrix(self.size, random.Random(seed)), seed, None)
+        else:
+            graded = select_board(self.bank, self.size, self.band)
+            self.ready.emit(graded.matrix, graded.seed, graded)
+
+class DuelWorker(QThread):
+    moved = pyqtSignal(int, int, str, object)
+    done = pyqtSignal(int)
+
+    def __init__(self, engines, strategies, snapshot, first_turn):
+        super().__init__()
+        self.engines = engines
+        self.strategies = strategies
+        self.snapshot = snapshot
+        self.first_turn = first_turn
+        self._is_running = True
+
+    def run(self):
+        # The whole duel runs here on a private board; the screen applies the
+        # reported moves on its own frame clock.
+        board = DominosaBoard.from_snapshot(self.snapshot)
+        turn = self.first_turn
+        while self._is_running:
+            engine = self.engines[turn]
+            move, reason = engine.solve_next_step(self.strategies[turn], board.snapshot())
+            if not self._is_running: return
+            if not move:
+                self.done.emit(2 if turn == 1 else 1)
+                return
+            board.confirm_edge(board.edges[move.index], turn)
+            self.moved.emit(move.index, turn, reason, engine.stats)
+            if not board.has_valid_moves():
+                self.done.emit(winner_when_stuck(turn))
+                return
+            turn = 1 if turn == 2 else 2
 
     def stop(self):
         self._is_running = False
+        for engine in self.engines.values():
+            engine.is_cancelled = True
 
 class ProgressBar(QWidget):
     def __init__(self):
@@ -75,7 +154,7 @@ class ProgressBar(QWidget):
 
     def set_progress(self, val):
         self.progress = val
-        self.repaint()
+        self.update()
 
     def paintEvent(self, e):
         qp = QPainter(self)
@@ -85,14 +164,25 @@ class ProgressBar(QWidget):
         fill_w = int(w * self.progress)
         qp.fillRect(0, 0, fill_w, h, QColor("#111111"))
 
+DEFAULT_CELL_SIZE = 60
+MIN_CELL_SIZE = 8
+MAX_CELL_SIZE = 120
+GRID_MIN_CELL_SIZE = 16
+TEXT_MIN_CELL_SIZE = 18
+FIT_BOARD_PX = 1000
+FRAME_MS = 16
+AVATAR_FRAME_EVERY = 3
+
 class BoardWidget(QWidget):
     move_made = pyqtSignal(object) 
     board_changed = pyqtSignal()
+    edge_removed = pyqtSignal(object)
+    zoomed = pyqtSignal(int, int, object)
     
     def __init__(self, board):
         super().__init__()
         self.board = board
-        self.cell_sz = 60
+        self.cell_sz = self.fitting_cell_size()
         self.update_dimensions()
         
         self.selected_node = None
@@ -108,9 +198,37 @@ class BoardWidget(QWidget):
         
         self.input_enabled = True 
 
+    def fitting_cell_size(self):
+        return max(MIN_CELL_SIZE, min(DEFAULT_CELL_SIZE, FIT_BOARD_PX // max(self.board.cols, self.board.rows)))
+
     def update_dimensions(self):
         self.setFixedSize(self.board.cols * self.cell_sz + 4, self.board.rows * self.cell_sz + 4)
 
+    def set_cell_size(self, size, anchor=None):
+        size = max(MIN_CELL_SIZE, min(MAX_CELL_SIZE, int(size)))
+        if size == self.cell_sz: return
+        old = self.cell_sz
+        self.cell_sz = size
+        self.update_dimensions()
+        self.zoomed.emit(old, size, anchor)
+        self.update()
+
+    def wheelEvent(self, e):
+        if not e.modifiers() & Qt.KeyboardModifier.ControlModifier:
+            e.ignore()
+            return
+        step = 1.15 if e.angleDelta().y() > 0 else 1 / 1.15
+        self.set_cell_size(round(self.cell_sz * step), e.position())
+        e.accept()
+
+    def visible_range(self, rect):
+        sz = self.cell_sz
+        r0 = max(0, rect.top() // sz)
+        c0 = max(0, rect.left() // sz)
+        r1 = min(self.board.rows - 1, rect.bottom() // sz)
+        c1 = min(self.board.cols - 1, rect.right() // sz)
+        return r0, r1, c0, c1
+
     def set_victory(self, state):
         self.victory_mode = state
         self.repaint()
@@ -138,6 +256,7 @@ class BoardWidget(QWidget):
                 for edge in clicked_node.edges:
                     if edge.state == BondState.CONFIRMED:
                         self.board.remove_edge(edge)
+                        self.edge_removed.emit(edge)
                         self.board_changed.emit()
                         self.repaint()
                         return
@@ -165,18 +284,23 @@ class BoardWidget(QWidget):
         self.repaint()
 
     def paintEvent(self, e):
+        # Only cells inside the exposed rectangle are touched, so a repaint
+        # costs the visible area rather than the whole board.
         qp = QPainter(self)
         qp.setRenderHint(QPainter.RenderHint.Antialiasing)
-        font_main = QFont("Segoe UI", 16, QFont.Weight.Bold)
-        qp.setFont(font_main)
+        sz = self.cell_sz
+        r0, r1, c0, c1 = self.visible_range(e.rect())
         
         if self.victory_mode:
-            qp.fillRect(self.rect(), QColor("#FFD700")) 
+            qp.fillRect(e.rect(), QColor("#FFD700")) 
         
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
+        draw_grid = not self.victory_mode and sz >= GRID_MIN_CELL_SIZE
+        # Keyed by index: EdgeBond compares by value and is not hashable.
+        confirmed = {}
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
                 cell = self.board.cells[r][c]
-                x, y = c * self.cell_sz, r * self.cell_sz
+                x, y = c * sz, r * sz
                 
                 bg = QColor("#FFFFFF")
                 if self.victory_mode:
@@ -186,51 +310,47 @@ class BoardWidget(QWidget):
                 elif cell == self.selected_node:
                     bg = QColor("#EEEEEE")
                 
-                qp.fillRect(x, y, self.cell_sz, self.cell_sz, bg)
-                if not self.victory_mode:
+                qp.fillRect(x, y, sz, sz, bg)
+                if draw_grid:
                     qp.setPen(QColor("#F0F0F0"))
-                    qp.drawRect(x, y, self.cell_sz, self.cell_sz)
-
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
-                cell = self.board.cells[r][c]
+                    qp.drawRect(x, y, sz, sz)
                 if cell.occupied:
-                    for edge in cell.edges:
-                        if edge.state == BondState.CONFIRMED:
-                            n = edge.node_a if edge.node_b == cell else edge.node_b
-                            if (n.c > c) or (n.r > r):
-                                x1, y1 = c * self.cell_sz, r * self.cell_sz
-                                x2, y2 = n.c * self.cell_sz, n.r * self.cell_sz
-                                
-                                rect_x = min(x1, x2) + 6
-                                rect_y = min(y1, y2) + 6
-                                rect_w = abs(x1 - x2) + self.cell_sz - 12
-                                rect_h = abs(y1 - y2) + self.cell_sz - 12
-                                
-                                color = QColor("#222") if cell.owner_id == 1 else QColor("#888")
-                                qp.setBrush(QBrush(color))
-                                qp.setPen(Qt.PenStyle.NoPen)
-                                qp.drawRoundedRect(QRectF(rect_x, rect_y, rect_w, rect_h), 14.0, 14.0)
+                    confirmed.update((edge.index, edge) for edge in cell.edges if edge.state == BondState.CONFIRMED)
+
+        pad = max(1, sz // 10)
+        radius = sz * 0.23
+        qp.setPen(Qt.PenStyle.NoPen)
+        for edge in confirmed.values():
+            n1, n2 = edge.node_a, edge.node_b
+            rect_x = min(n1.c, n2.c) * sz + pad
+            rect_y = min(n1.r, n2.r) * sz + pad
+            rect_w = abs(n1.c - n2.c) * sz + sz - 2 * pad
+            rect_h = abs(n1.r - n2.r) * sz + sz - 2 * pad
+            
+            color = QColor("#222") if edge.owner_id == 1 else QColor("#888")
+            qp.setBrush(QBrush(color))
+            qp.drawRoundedRect(QRectF(rect_x, rect_y, rect_w, rect_h), radius, radius)
 
         if self.hint_edge:
             n1, n2 = self.hint_edge.node_a, self.hint_edge.node_b
-            x1, y1 = n1.c * self.cell_sz + self.cell_sz/2, n1.r * self.cell_sz + self.cell_sz/2
-            x2, y2 = n2.c * self.cell_sz + self.cell_sz/2, n2.r * self.cell_sz + self.cell_sz/2
+            x1, y1 = n1.c * sz + sz/2, n1.r * sz + sz/2
+            x2, y2 = n2.c * sz + sz/2, n2.r * sz + sz/2
             
-            pen = QPen(QColor(180, 180, 180, 180)); pen.setWidth(40); pen.setCapStyle(Qt.PenCapStyle.RoundCap)
+            pen = QPen(QColor(180, 180, 180, 180)); pen.setWidth(max(2, sz * 2 // 3)); pen.setCapStyle(Qt.PenCapStyle.RoundCap)
             qp.setPen(pen)
             qp.drawLine(int(x1), int(y1), int(x2), int(y2))
 
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
+        # Level of detail: digits are unreadable below a few pixels, skip them.
+        if sz < TEXT_MIN_CELL_SIZE: return
+        font_main = QFont("Segoe UI")
+        font_main.setPixelSize(max(8, sz * 36 // 100))
+        font_main.setWeight(QFont.Weight.Bold)
+        qp.setFont(font_main)
+        for r in range(r0, r1 + 1):
+            for c in range(c0, c1 + 1):
                 cell = self.board.cells[r][c]
-                x, y = c * self.cell_sz, r * self.cell_sz
-                
-                fg = QColor("#000000")
-                if cell.occupied: fg = QColor("#FFFFFF")
-                
-                qp.setPen(fg)
-                qp.drawText(x, y, self.cell_sz, self.cell_sz, Qt.AlignmentFlag.AlignCenter, str(cell.value))
+                qp.setPen(QColor("#FFFFFF") if cell.occupied else QColor("#000000"))
+                qp.drawText(c * sz, r * sz, sz, sz, Qt.AlignmentFlag.AlignCenter, str(cell.value))
 
 class GameScreen(QWidget):
     def __init__(self, parent, mode):
@@ -239,17 +359,35 @@ class GameScreen(QWidget):
         self.mode = mode 
         
         self.board = DominosaBoard(GRID_HARD)
-        self.engine_1 = SolverEngine(self.board)
-        self.engine_2 = SolverEngine(self.board)
+        self.table = GameTable()
+        self.engine_1 = SolverEngine(self.board.fork(), store=self.parent.tt_store, table=self.table)
+        self.engine_2 = SolverEngine(self.board.fork(), store=self.parent.tt_store, table=self.table)
         
         self.current_turn = 1 
         self.game_over = False
         self.worker = None 
+        self.bank = BoardBank.load(DEFAULT_BANK)
+        self.board_seed = -1
+        self.recorder = None
+        self.stream_worker = None
+        self.pending_moves = []
+        self.duel_worker = None
+        self.select_worker = None
+        self.turbo_moves = []
+        self.turbo_winner = 0
+        self.frame_count = 0
+        
+        self.stream_timer = QTimer()
+        self.stream_timer.timeout.connect(self.play_next_streamed_move)
         
         self.status_timer = QTimer()
         self.status_timer.setSingleShot(True)
         self.status_timer.timeout.connect(lambda: self.lbl_status.setText("YOUR TURN"))
         
+        self.frame_timer = QTimer()
+        self.frame_timer.setInterval(FRAME_MS)
+        self.frame_timer.timeout.connect(self.on_frame)
+        
         self.init_ui()
         
         if mode == "DUEL":
@@ -258,6 +396,12 @@ class GameScreen(QWidget):
 
     def cleanup(self):
         if self.status_timer.isActive(): self.status_timer.stop()
+        self.stop_stream()
+        self.stop_turbo()
+        self.stop_recording()
+        if self.select_worker and self.select_worker.isRunning():
+            self.select_worker.ready.disconnect()
+            self.select_worker.wait()
         if self.worker and self.worker.isRunning():
             self.worker.stop()
             self.worker.quit()
@@ -285,10 +429,14 @@ class GameScreen(QWidget):
         gen_lay.setSpacing(10)
         self.combo_size = QComboBox()
         self.combo_size.addItems(["Double-2", "Double-3", "Double-4", "Double-5", "Double-6"])
-        btn_gen = QPushButton("GENERATE PUZZLE"); btn_gen.setObjectName("ActionBtn")
-        btn_gen.clicked.connect(self.generate_new_board)
+        self.btn_gen = QPushButton("GENERATE PUZZLE"); self.btn_gen.setObjectName("ActionBtn")
+        self.btn_gen.clicked.connect(self.generate_new_board)
+        self.combo_band = QComboBox()
+        self.refresh_bands()
+        self.combo_size.currentTextChanged.connect(self.refresh_bands)
         gen_lay.addWidget(self.combo_size)
-        gen_lay.addWidget(btn_gen)
+        gen_lay.addWidget(self.combo_band)
+        gen_lay.addWidget(self.btn_gen)
         
         top_ctrl.addWidget(btn_back)
         top_ctrl.addStretch()
@@ -325,9 +473,12 @@ class GameScreen(QWidget):
             hint_box.addWidget(lbl_help, alignment=Qt.AlignmentFlag.AlignHCenter)
             self.combo_hint = QComboBox(); self.combo_hint.addItems(STRATEGIES)
             hint_box.addWidget(self.combo_hint)
-            btn_hint = QPushButton("GET HINT"); btn_hint.setObjectName("ActionBtn")
-            btn_hint.clicked.connect(self.get_hint)
-            hint_box.addWidget(btn_hint)
+            self.btn_hint = QPushButton("GET HINT"); self.btn_hint.setObjectName("ActionBtn")
+            self.btn_hint.clicked.connect(self.get_hint)
+            hint_box.addWidget(self.btn_hint)
+            self.btn_solve_all = QPushButton("SOLVE ALL"); self.btn_solve_all.setObjectName("ActionBtn")
+            self.btn_solve_all.clicked.connect(self.solve_all)
+            hint_box.addWidget(self.btn_solve_all)
             left_col.addLayout(hint_box)
             
         left_col.addStretch()
@@ -347,7 +498,19 @@ class GameScreen(QWidget):
         self.board_wid = BoardWidget(self.board)
         self.board_wid.move_made.connect(self.handle_human_move)
         self.board_wid.board_changed.connect(self.update_progress)
-        center_col.addWidget(self.board_wid, alignment=Qt.AlignmentFlag.AlignCenter)
+        self.board_wid.edge_removed.connect(self.record_removal)
+        self.board_wid.zoomed.connect(self.on_board_zoomed)
+        self.board_scroll = QScrollArea()
+        self.board_scroll.setFrameShape(QFrame.Shape.NoFrame)
+        self.board_scroll.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.board_scroll.setWidget(self.board_wid)
+        center_col.addWidget(self.board_scroll, 1)
+        
+        self.lbl_stats = QLabel("")
+        self.lbl_stats.setObjectName("Subtitle")
+        self.lbl_stats.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        center_col.addSpacing(10)
+        center_col.addWidget(self.lbl_stats)
         cols_lay.addLayout(center_col, 3)
         
         right_col = QVBoxLayout()
@@ -363,24 +526,48 @@ class GameScreen(QWidget):
                 self.btn_start = QPushButton("START DUEL"); self.btn_start.setObjectName("ActionBtn")
                 self.btn_start.clicked.connect(self.start_duel)
                 right_col.addWidget(self.btn_start)
+                self.chk_turbo = QCheckBox("TURBO")
+                self.chk_turbo.setToolTip("Play the duel as fast as the engines allow, drawn at 60 fps")
+                right_col.addWidget(self.chk_turbo, alignment=Qt.AlignmentFlag.AlignHCenter)
         
         right_col.addStretch()
         cols_lay.addLayout(right_col, 1)
         main_lay.addLayout(cols_lay)
 
+    def selected_size(self):
+        return int(self.combo_size.currentText().split("-")[1])
+
+    def refresh_bands(self):
+        # Only offer bands that generated boards of this size actually reach.
+        current = self.combo_band.currentText()
+        self.combo_band.clear()
+        self.combo_band.addItems(["ANY"] + list(reachable_bands(self.selected_size(), self.bank)))
+        index = self.combo_band.findText(current)
+        self.combo_band.setCurrentIndex(max(index, 0))
+
     def generate_new_board(self):
-        size_txt = self.combo_size.currentText()
-        n = int(size_txt.split("-")[1])
+        if self.select_worker and self.select_worker.isRunning(): return
         self.lbl_status.setText("GENERATING UNIQUE BOARD...")
-        QApplication.processEvents()
-        
-        matrix = self._build_valid_matrix(n)
+        self.btn_gen.setEnabled(False)
+        self.select_worker = BoardSelectWorker(self.bank, self.selected_size(), self.combo_band.currentText())
+        self.select_worker.ready.connect(self.on_board_selected)
+        self.select_worker.start()
+
+    def on_board_selected(self, matrix, seed, graded):
+        self.btn_gen.setEnabled(True)
+        self.board_seed = seed
+        self.stop_stream()
+        self.stop_turbo()
+        self.stop_recording()
+        self.lbl_stats.setText("" if graded is None else f"{graded.band} · score {graded.score:.2f}")
         
         self.board = DominosaBoard(matrix)
-        self.engine_1 = SolverEngine(self.board)
-        self.engine_2 = SolverEngine(self.board)
+        self.table = GameTable()
+        self.engine_1 = SolverEngine(self.board.fork(), store=self.parent.tt_store, table=self.table)
+        self.engine_2 = SolverEngine(self.board.fork(), store=self.parent.tt_store, table=self.table)
         
         self.board_wid.board = self.board
+        self.board_wid.cell_sz = self.board_wid.fitting_cell_size()
         self.board_wid.update_dimensions()
         self.board_wid.selected_node = None
         self.board_wid.hint_edge = None
@@ -394,6 +581,7 @@ class GameScreen(QWidget):
             self.btn_start.setEnabled(True)
             self.combo_algo_1.setEnabled(True)
             self.combo_algo_2.setEnabled(True)
+            self.chk_turbo.setEnabled(True)
             self.timer_duel.stop()
             self.lbl_status.setText("READY")
         else:
@@ -403,88 +591,106 @@ class GameScreen(QWidget):
         self.update_progress()
         self.board_wid.repaint()
 
-    def _build_valid_matrix(self, n):
-        rows, cols = n + 1, n + 2
-        dominoes = []
-        for i in range(n + 1):
-            for j in range(i, n + 1):
-                dominoes.append(tuple(sorted((i, j))))
-        
-        while True:
-            grid = [[-1]*cols for _ in range(rows)]
-            d_list = list(dominoes)
-            random.shuffle(d_list)
-            
-            def place(idx):
-                if idx == len(d_list): return True
-                r, c = -1, -1
-                for i in range(rows):
-                    for j in range(cols):
-                        if grid[i][j] == -1:
-                            r, c = i, j
-                            break
-                    if r != -1: break
-                
-                d = d_list[idx]
-                placements = [(0, 1), (1, 0)]
-                random.shuffle(placements)
-                for dr, dc in placements:
-                    nr, nc = r + dr, c + dc
-                    if nr < rows and nc < cols and grid[nr][nc] == -1:
-                        v1, v2 = d if random.random() > 0.5 else (d[1], d[0])
-                        grid[r][c] = v1
-                        grid[nr][nc] = v2
-                        if place(idx + 1): return True
-                        grid[r][c] = -1
-                        grid[nr][nc] = -1
-                return False
-            
-            if not place(0): continue
-            
-            solutions = [0]
-            def check_unique(mask, available):
-                if solutions[0] > 1: return
-                if not available:
-                    solutions[0] += 1
-                    return
-                
-                idx = 0
-                while (mask & (1 << idx)): idx += 1
-                r, c = idx // cols, idx % cols
-                
-                if c + 1 < cols and not (mask & (1 << (idx + 1))):
-                    v1, v2 = grid[r][c], grid[r][c+1]
-                    pair = tuple(sorted((v1, v2)))
-                    if pair in available:
-                        av2 = set(available)
-                        av2.remove(pair)
-                        check_unique(mask | (1 << idx) | (1 << (idx + 1)), av2)
-                
-                if r + 1 < rows and not (mask & (1 << (idx + cols))):
-                    v1, v2 = grid[r][c], grid[r+1][c]
-                    pair = tuple(sorted((v1, v2)))
-                    if pair in available:
-                        av2 = set(available)
-                        av2.remove(pair)
-                        check_unique(mask | (1 << idx) | (1 << (idx + cols)), av2)
-            
-            check_unique(0, set(dominoes))
-            if solutions[0] == 1:
-                return grid
-
     def get_hint(self):
         strat = self.combo_hint.currentText()
         self.lbl_status.setText("ANALYZING...")
         QApplication.processEvents()
         
-        move = self.engine_1.get_hint_move(strat)
+        move = self.engine_1.get_hint_move(strat, self.board.snapshot())
+        self.show_stats(self.engine_1.stats)
         if move:
             self.lbl_status.setText("HINT FOUND")
-            self.board_wid.show_hint(move)
+            self.board_wid.show_hint(self.board.edges[move.index])
             self.status_timer.start(2000)
         else:
             self.lbl_status.setText("PUZZLE BLOCKED")
 
+    def solve_all(self):
+        self.stop_stream()
+        self.set_solo_controls(False)
+        self.board_wid.input_enabled = False
+        self.lbl_status.setText("SOLVING...")
+        self.stream_worker = SolutionStreamWorker(self.engine_1, self.combo_hint.currentText(), self.board.snapshot())
+        self.stream_worker.step.connect(self.on_stream_step)
+        self.stream_worker.done.connect(self.on_stream_done)
+        self.stream_worker.start()
+        self.stream_timer.start(60)
+
+    def on_stream_step(self, move, reason, stats):
+        self.pending_moves.append((move, reason))
+        self.show_stats(stats)
+
+    def on_stream_done(self, reason):
+        self.pending_moves.append((None, reason))
+
+    def play_next_streamed_move(self):
+        if not self.pending_moves: return
+        move, reason = self.pending_moves.pop(0)
+        if move is None:
+            self.stream_timer.stop()
+            self.set_solo_controls(True)
+            if not self.game_over:
+                self.board_wid.input_enabled = True
+                self.lbl_status.setText("PUZZLE BLOCKED" if reason == "Unsolvable" else reason.upper())
+            return
+        self.lbl_status.setText(reason.upper())
+        self.board.confirm_edge(self.board.edges[move.index], 1)
+        self.update_progress()
+        self.board_wid.repaint()
+        self.check_win_condition()
+
+    def stop_stream(self):
+        self.stream_timer.stop()
+        self.pending_moves = []
+        if self.stream_worker and self.stream_worker.isRunning():
+            self.stream_worker.stop()
+            self.stream_worker.wait()
+        self.stream_worker = None
+        if self.mode == "SOLO" and hasattr(self, "btn_solve_all"):
+            self.set_solo_controls(True)
+
+    def set_solo_controls(self, enabled):
+        # The stream owns engine_1 while it runs, so hints and strategy
+        # changes wait until it finishes or is stopped.
+        for widget in (self.btn_hint, self.combo_hint, self.btn_solve_all):
+            widget.setEnabled(enabled)
+
+    def start_recording(self, strategies):
+        self.stop_recording()
+        self.recorder = GameRecorder.open(new_record_path(tag=self.mode.lower()),
+                                          self.board.matrix_data, self.board_seed, strategies,
+                                          self.engine_1.time_budget)
+
+    def record_move(self, edge_idx, owner):
+        if self.mode == "SOLO": return
+        if self.recorder is None:
+            self.start_recording((HUMAN, self.combo_algo_2.currentText()))
+        self.recorder.record(edge_idx, owner)
+
+    def record_removal(self, edge):
+        if self.recorder is not None:
+            self.recorder.record_removal(edge.index)
+
+    def stop_recording(self):
+        if self.recorder is not None:
+            self.recorder.close()
+            self.recorder = None
+
+    def on_board_zoomed(self, old, new, anchor):
+        # Keep the board point under the cursor (or the view centre) in place.
+        for bar, viewport_len, pos in ((self.board_scroll.horizontalScrollBar(), self.board_scroll.viewport().width(),
+                                        anchor.x() if anchor is not None else None),
+                                       (self.board_scroll.verticalScrollBar(), self.board_scroll.viewport().height(),
+                                        anchor.y() if anchor is not None else None)):
+            if pos is None:
+                pos = bar.value() + viewport_len / 2
+            offset = pos - bar.value()
+            bar.setValue(int(pos * new / old - offset))
+
+    def show_stats(self, stats):
+        self.lbl_stats.setText(f"{stats.strategy}: {stats.summary()}")
+        self.lbl_stats.setToolTip(stats.to_json())
+
     def update_progress(self):
         val = self.board.get_progress()
         self.prog_bar.set_progress(val)
@@ -494,9 +700,13 @@ class GameScreen(QWidget):
         
         success = self.board.confirm_edge(edge, self.current_turn)
         if success:
+            self.record_move(edge.index, self.current_turn)
             self.update_progress()
             self.check_win_condition()
             
+            if self.mode == "SOLO" and not self.game_over and count_solutions(self.board, limit=1) == 0:
+                self.lbl_status.setText("DEAD END: REMOVE A PIECE")
+            
             if not self.game_over and self.mode != "SOLO":
                 self.current_turn = 2
                 self.update_turn_state()
@@ -505,8 +715,67 @@ class GameScreen(QWidget):
         self.btn_start.setEnabled(False)
         self.combo_algo_1.setEnabled(False)
         self.combo_algo_2.setEnabled(False)
+        self.chk_turbo.setEnabled(False)
         self.current_turn = 1
-        self.run_ai_turn()
+        self.start_recording((self.combo_algo_1.currentText(), self.combo_algo_2.currentText()))
+        if self.chk_turbo.isChecked():
+            self.start_turbo()
+        else:
+            self.run_ai_turn()
+
+    def start_turbo(self):
+        strategies = {1: self.combo_algo_1.currentText(), 2: self.combo_algo_2.currentText()}
+        self.duel_worker = DuelWorker({1: self.engine_1, 2: self.engine_2}, strategies,
+                                      self.board.snapshot(), self.current_turn)
+        self.duel_worker.moved.connect(self.on_turbo_move)
+        self.duel_worker.done.connect(self.on_turbo_done)
+        self.turbo_moves = []
+        self.turbo_winner = 0
+        self.frame_count = 0
+        self.av1.use_frame_clock(True); self.av2.use_frame_clock(True)
+        self.lbl_status.setText("TURBO DUEL")
+        self.frame_timer.start()
+        self.duel_worker.start()
+
+    def on_turbo_move(self, edge_idx, owner, reason, stats):
+        self.turbo_moves.append((edge_idx, owner, stats))
+
+    def on_turbo_done(self, winner):
+        self.turbo_winner = winner
+
+    def on_frame(self):
+        # Moves that arrived since the last frame are applied together, and the
+        # board, progress bar and avatars are redrawn once for all of them.
+        self.frame_count += 1
+        if self.frame_count % AVATAR_FRAME_EVERY == 0:
+            self.av1.advance_frame(); self.av2.advance_frame()
+        if self.turbo_moves:
+            moves, self.turbo_moves = self.turbo_moves, []
+            for edge_idx, owner, _ in moves:
+                self.board.confirm_edge(self.board.edges[edge_idx], owner)
+                self.record_move(edge_idx, owner)
+            _, owner, stats = moves[-1]
+            self.current_turn = 1 if owner == 2 else 2
+            self.show_stats(stats)
+            self.lbl_status.setText(f"TURBO DUEL · {len(self.board.placements)} PLACED")
+            self.av1.set_state("THINKING" if self.current_turn == 1 else "IDLE")
+            self.av2.set_state("THINKING" if self.current_turn == 2 else "IDLE")
+            self.board_wid.update()
+            self.update_progress()
+        if self.turbo_winner:
+            winner = self.turbo_winner
+            self.stop_turbo()
+            self.declare_winner(winner)
+
+    def stop_turbo(self):
+        self.frame_timer.stop()
+        if self.duel_worker and self.duel_worker.isRunning():
+            self.duel_worker.stop()
+            self.duel_worker.wait()
+        self.duel_worker = None
+        self.turbo_moves = []
+        self.turbo_winner = 0
+        self.av1.use_frame_clock(False); self.av2.use_frame_clock(False)
 
     def update_turn_state(self):
         if self.current_turn == 1:
@@ -532,15 +801,18 @@ class GameScreen(QWidget):
         if self.worker and self.worker.isRunning():
             self.worker.wait()
             
-        self.worker = StrategyWorker(engine, strat_name)
+        self.worker = StrategyWorker(engine, strat_name, self.board.snapshot())
         self.worker.finished.connect(self.on_ai_complete)
         self.worker.start()
 
-    def on_ai_complete(self, move, reason, nodes):
+    def on_ai_complete(self, move, reason, stats):
         if self.game_over: return
+        self.show_stats(stats)
         
         if move:
+            move = self.board.edges[move.index]
             self.board.confirm_edge(move, self.current_turn)
+            self.record_move(move.index, self.current_turn)
             self.board_wid.repaint()
             self.update_progress()
             
@@ -556,18 +828,20 @@ class GameScreen(QWidget):
                 else:
                     self.update_turn_state()
         else:
-            self.game_over = True
-            
-            winner_name = ""
-            if self.current_turn == 1:
-                winner_name = self.combo_algo_2.currentText() if self.mode != "SOLO" else "CPU"
-                self.av1.set_state("DEFEAT"); self.av2.set_state("VICTORY")
-            else:
-                winner_name = self.combo_algo_1.currentText() if self.mode == "DUEL" else "PLAYER 1"
-                self.av2.set_state("DEFEAT"); self.av1.set_state("VICTORY")
+            self.declare_winner(2 if self.current_turn == 1 else 1)
 
-            self.lbl_status.setText(f"VICTORY: {winner_name} WINS")
-            self.board_wid.set_victory(True)
+    def declare_winner(self, seat):
+        self.game_over = True
+        self.board_wid.set_victory(True)
+        if self.mode == "DUEL": self.timer_duel.stop()
+
+        if seat == 2:
+            winner_name = self.combo_algo_2.currentText()
+            self.av1.set_state("DEFEAT"); self.av2.set_state("VICTORY")
+        else:
+            winner_name = self.combo_algo_1.currentText() if self.mode == "DUEL" else "PLAYER 1"
+            self.av2.set_state("DEFEAT"); self.av1.set_state("VICTORY")
+        self.lbl_status.setText(f"VICTORY: {winner_name} WINS")
 
     def check_win_condition(self):
         if self.mode == "SOLO":
@@ -577,21 +851,7 @@ class GameScreen(QWidget):
                 self.board_wid.set_victory(True)
         else:
             if not self.board.has_valid_moves():
-                self.game_over = True
-                self.board_wid.set_victory(True)
-                if self.mode == "DUEL": self.timer_duel.stop()
-
-                winner_name = ""
-                if self.current_turn == 1:
-                    winner_name = self.combo_algo_2.currentText() if self.mode != "SOLO" else "CPU"
-                    self.av1.set_state("DEFEAT")
-                    self.av2.set_state("VICTORY")
-                else:
-                    winner_name = self.combo_algo_1.currentText() if self.mode == "DUEL" else "PLAYER 1"
-                    self.av2.set_state("DEFEAT")
-                    self.av1.set_state("VICTORY")
-                
-                self.lbl_status.setText(f"VICTORY: {winner_name} WINS")
+                self.declare_winner(winner_when_stuck(self.current_turn))
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -599,6 +859,7 @@ class MainWindow(QMainWindow):
         self.setWindowTitle("DOMINOSA STRATEGY ENGINE")
         self.resize(1280, 850)
         self.setStyleSheet(STYLES)
+        self.tt_store = ttstore.open_default()
         self.stack = QStackedWidget()
         self.setCentralWidget(self.stack)
         self.create_landing()
@@ -626,6 +887,14 @@ class MainWindow(QMainWindow):
         self.stack.addWidget(game)
         self.stack.setCurrentWidget(game)
 
+    def closeEvent(self, e):
+        current = self.stack.currentWidget()
+        if isinstance(current, GameScreen):
+            current.cleanup()
+        if self.tt_store is not None:
+            self.tt_store.close()
+        super().closeEvent(e)
+
     def switch_to_landing(self):
         current = self.stack.currentWidget()
         if isinstance(current, GameScreen):
@@ -635,7 +904,7 @@ class MainWindow(QMainWindow):
         self.stack.setCurrentIndex(0)
 
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    app = QApplication(profiling.configure_from_args(sys.argv))
     win = MainWindow()
     win.showMaximized()
     sys.exit(app.exec())
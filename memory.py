@@ -0,0 +1,80 @@
+import os
+import sys
+import tracemalloc
+from typing import Optional
+
+MEMORY_LIMIT_ENV = "DOMINOSA_MEMORY_LIMIT"
+TRACEMALLOC_ENV = "DOMINOSA_TRACEMALLOC"
+# Rough CPython costs of one memo slot (hash entry plus boxed value) and of
+# one level of search recursion (frame, move list, tiling sets).
+ENTRY_BYTES = 96
+FRAME_BYTES = 2048
+HIGH_WATER = 0.9
+EVICT_FRACTION = 0.5
+CHECK_MASK = 1023
+
+_UNITS = {"": 1, "K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text: str) -> int:
+    text = text.strip().upper().rstrip("B").rstrip("I")
+    unit = text[-1:] if text[-1:] in _UNITS else ""
+    value = float(text[:len(text) - len(unit)])
+    if value <= 0:
+        raise ValueError(f"Memory limit must be positive, got '{text}'")
+    return int(value * _UNITS[unit])
+
+
+def format_size(size: int) -> str:
+    for unit in ("G", "M", "K"):
+        if size >= _UNITS[unit]:
+            return f"{size / _UNITS[unit]:.1f} {unit}B"
+    return f"{size} B"
+
+
+class MemoryBudget:
+    # Usage is estimated from memo entry counts and search depth. With
+    # sampling on, tracemalloc's figure is used whenever it is larger; it
+    # costs allocation speed, so it is opt-in.
+    def __init__(self, limit: Optional[int] = None, sample: bool = False):
+        self.limit = limit
+        self.sample = sample
+        self.key_bytes = 0
+        self.peak = 0
+        if sample and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self.baseline = tracemalloc.get_traced_memory()[0] if sample else 0
+
+    @classmethod
+    def from_env(cls) -> 'MemoryBudget':
+        raw = os.environ.get(MEMORY_LIMIT_ENV)
+        return cls(parse_size(raw) if raw else None, os.environ.get(TRACEMALLOC_ENV, "0") not in ("", "0"))
+
+    def size_keys(self, key_bits: int):
+        self.key_bytes = sys.getsizeof(1 << key_bits)
+
+    def usage(self, entries: int, depth: int = 0) -> int:
+        used = entries * (ENTRY_BYTES + self.key_bytes) + depth * FRAME_BYTES
+        if self.sample:
+            used = max(used, tracemalloc.get_traced_memory()[0] - self.baseline)
+        if used > self.peak:
+            self.peak = used
+        return used
+
+    def near_limit(self, used: int) -> bool:
+        return self.limit is not None and used >= self.limit * HIGH_WATER
+
+    def over_limit(self, used: int) -> bool:
+        return self.limit is not None and used >= self.limit
+
+    def begin(self, entries: int):
+        self.peak = 0
+        if self.sample:
+            tracemalloc.reset_peak()
+        self.usage(entries)
+
+    def finish(self, entries: int) -> int:
+        self.usage(entries)
+        if self.sample:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1] - self.baseline)
+        return self.peak
@@ -0,0 +1,88 @@
+import random
+
+from structures import CellNode, EdgeBond
+from typing import Dict, List, Optional, Tuple
+
+MAX_KILLERS = 2
+
+
+class MoveOrdering:
+    def __init__(self, seed: Optional[int] = None):
+        self.history: Dict[int, int] = {}
+        self.killers: Dict[int, List[int]] = {}
+        # Seeded orderings break remaining ties randomly so that several
+        # searches over the same position explore different subtrees first.
+        self.rng = random.Random(seed) if seed is not None else None
+        self.noise: Dict[int, float] = {}
+
+    def reset(self):
+        self.history.clear()
+        self.killers.clear()
+
+    def count_options(self, moves: List[EdgeBond]) -> Tuple[Dict[CellNode, int], Dict[Tuple[int, int], int]]:
+        cell_opts: Dict[CellNode, int] = {}
+        pair_opts: Dict[Tuple[int, int], int] = {}
+        for e in moves:
+            cell_opts[e.node_a] = cell_opts.get(e.node_a, 0) + 1
+            cell_opts[e.node_b] = cell_opts.get(e.node_b, 0) + 1
+            pair = e.get_pair_id()
+            pair_opts[pair] = pair_opts.get(pair, 0) + 1
+        return cell_opts, pair_opts
+
+    def _sorted(self, moves: List[EdgeBond], cell_opts, pair_opts, depth: int, tt_move: int) -> List[EdgeBond]:
+        killers = self.killers.get(depth, ())
+        history = self.history
+        noise = self.noise
+        if self.rng is not None:
+            for e in moves:
+                if e.index not in noise:
+                    noise[e.index] = self.rng.random()
+
+        def key(e: EdgeBond):
+            options = min(cell_opts[e.node_a], cell_opts[e.node_b], pair_opts[e.get_pair_id()])
+            return (e.index != tt_move, options, e.index not in killers, -history.get(e.index, 0),
+                    noise.get(e.index, 0.0))
+
+        return sorted(moves, key=key)
+
+    def order(self, moves: List[EdgeBond], depth: int = 0, tt_move: int = -1) -> List[EdgeBond]:
+        cell_opts, pair_opts = self.count_options(moves)
+        return self._sorted(moves, cell_opts, pair_opts, depth, tt_move)
+
+    def branch_moves(self, moves: List[EdgeBond], free_cells: int, depth: int = 0) -> List[EdgeBond]:
+        # Every free cell and every remaining pair must be covered exactly once,
+        # so branching on the options of the tightest one is complete.
+        cell_opts, pair_opts = self.count_options(moves)
+        if len(cell_opts) < free_cells:
+            return []
+
+        best_cell = min(cell_opts, key=cell_opts.get)
+        best_pair = min(pair_opts, key=pair_opts.get)
+        if cell_opts[best_cell] <= pair_opts[best_pair]:
+            subset = [e for e in moves if e.node_a == best_cell or e.node_b == best_cell]
+        else:
+            subset = [e for e in moves if e.get_pair_id() == best_pair]
+        return self._sorted(subset, cell_opts, pair_opts, depth, -1)
+
+    def order_indices(self, moves: List[int], depth: int = 0) -> List[int]:
+        # Killers and history only, for game-tree nodes that work on edge indices.
+        killers = self.killers.get(depth, ())
+        history = self.history
+        noise = self.noise
+        if self.rng is not None:
+            for i in moves:
+                if i not in noise:
+                    noise[i] = self.rng.random()
+        return sorted(moves, key=lambda i: (i not in killers, -history.get(i, 0), noise.get(i, 0.0)))
+
+    def record_success(self, move: EdgeBond, depth: int, weight: int):
+        self.record_index(move.index, depth, weight)
+
+    def record_index(self, index: int, depth: int, weight: int):
+        self.history[index] = self.history.get(index, 0) + weight
+
+        slot = self.killers.setdefault(depth, [])
+        if index in slot:
+            return
+        slot.insert(0, index)
+        del slot[MAX_KILLERS:]
@@ -0,0 +1,138 @@
+import atexit
+import json
+import multiprocessing
+import os
+import threading
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Dict, Optional, Sequence, Tuple
+
+from board import DominosaBoard
+from solver import SolverEngine
+from structures import BoardSnapshot
+
+Entrant = Tuple[str, Optional[int]]
+
+# BACKTRACKING is left out: its tiling check ignores the pairs, so its moves
+# are not proven. Seeded DP entrants search the same position in other orders.
+DEFAULT_ENTRANTS: Tuple[Entrant, ...] = (
+    ("GREEDY", None), ("PROBING", None), ("DYNAMIC_PROGRAMMING", None),
+    ("DIVIDE_CONQUER", None), ("SAT", None), ("DYNAMIC_PROGRAMMING", 1), ("DYNAMIC_PROGRAMMING", 2))
+# An empty answer from these is a proof that the position is unsolvable.
+COMPLETE_STRATEGIES = ("DYNAMIC_PROGRAMMING", "DIVIDE_CONQUER", "SAT")
+LOG_ENV = "DOMINOSA_PORTFOLIO_LOG"
+CANCEL_SLOTS = 64
+CANCEL_POLL = 0.005
+MAX_WORKER_ENGINES = 16
+
+_cancel_slots = None
+_engines: Dict[Tuple, SolverEngine] = {}
+
+
+def entrant_label(strategy: str, seed: Optional[int]) -> str:
+    return strategy if seed is None else f"{strategy}#{seed}"
+
+
+def _init_worker(cancel_slots):
+    global _cancel_slots
+    _cancel_slots = cancel_slots
+
+
+def _run_entrant(race_id: int, snapshot: BoardSnapshot, strategy: str, seed: Optional[int]):
+    # Engines stay alive in the worker between races so their memos stay warm.
+    key = (snapshot.matrix, strategy, seed)
+    engine = _engines.get(key)
+    if engine is None:
+        if len(_engines) >= MAX_WORKER_ENGINES:
+            _engines.clear()
+        engine = _engines[key] = SolverEngine(DominosaBoard.from_snapshot(snapshot), seed=seed)
+
+    done = threading.Event()
+
+    def watch():
+        # solve_next_step clears is_cancelled on entry, so keep re-asserting it.
+        while not done.wait(CANCEL_POLL):
+            if _cancel_slots[race_id % CANCEL_SLOTS] == race_id:
+                engine.is_cancelled = True
+
+    watcher = threading.Thread(target=watch, daemon=True)
+    watcher.start()
+    start = time.perf_counter()
+    try:
+        move, reason = engine.solve_next_step(strategy, snapshot)
+    finally:
+        done.set()
+        watcher.join()
+    return (strategy, seed, move.index if move else -1, reason, time.perf_counter() - start,
+            engine.is_cancelled, engine.memory_exhausted)
+
+
+class Portfolio:
+    def __init__(self, entrants: Sequence[Entrant] = DEFAULT_ENTRANTS, workers: Optional[int] = None,
+                 log_path: Optional[str] = None):
+        self.entrants = list(entrants)
+        ctx = multiprocessing.get_context("spawn")
+        self.cancel_slots = ctx.Array("q", CANCEL_SLOTS)
+        self.executor = ProcessPoolExecutor(max_workers=workers or len(self.entrants), mp_context=ctx,
+                                            initializer=_init_worker, initargs=(self.cancel_slots,))
+        self.lock = threading.Lock()
+        self.races = 0
+        self.wins: Counter = Counter()
+        self.log_path = log_path or os.environ.get(LOG_ENV)
+
+    def _record(self, label: str, snapshot: BoardSnapshot, elapsed: float, move: int):
+        with self.lock:
+            self.wins[label] += 1
+            if not self.log_path:
+                return
+            cells = sum(len(row) for row in snapshot.matrix)
+            with open(self.log_path, "a") as fh:
+                fh.write(json.dumps({"size": len(snapshot.matrix) - 1, "placed": len(snapshot.placements),
+                                     "free_cells": cells - 2 * len(snapshot.placements),
+                                     "winner": label, "move": move, "ms": round(elapsed * 1000, 3)}) + "\n")
+
+    def race(self, snapshot: BoardSnapshot, timeout: Optional[float] = None,
+             should_stop: Optional[Callable[[], bool]] = None) -> Tuple[Optional[int], str, Optional[str]]:
+        with self.lock:
+            self.races += 1
+            race_id = self.races
+        pending = {self.executor.submit(_run_entrant, race_id, snapshot, strategy, seed)
+                   for strategy, seed in self.entrants}
+        deadline = None if timeout is None else time.perf_counter() + timeout
+
+        try:
+            while pending:
+                if should_stop is not None and should_stop():
+                    return None, "Cancelled", None
+                if deadline is not None and time.perf_counter() > deadline:
+                    return None, "Portfolio Timeout", None
+                done, pending = wait(pending, 0.05, FIRST_COMPLETED)
+                for future in done:
+                    strategy, seed, idx, reason, elapsed, cancelled, exhausted = future.result()
+                    if cancelled or exhausted or (idx < 0 and strategy not in COMPLETE_STRATEGIES):
+                        continue
+                    label = entrant_label(strategy, seed)
+                    self._record(label, snapshot, elapsed, idx)
+                    return (idx if idx >= 0 else None), f"Portfolio: {label} ({reason})", label
+            return None, "Portfolio Exhausted", None
+        finally:
+            self.cancel_slots[race_id % CANCEL_SLOTS] = race_id
+            for future in pending:
+                future.cancel()
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+_shared: Optional[Portfolio] = None
+_shared_lock = threading.Lock()
+
+
+def shared_portfolio() -> Portfolio:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = Portfolio()
+            atexit.register(_shared.shutdown)
+        return _shared
@@ -0,0 +1,185 @@
+import cProfile
+import functools
+import itertools
+import os
+import pstats
+import sys
+import threading
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+PROFILE_ENV = "DOMINOSA_PROFILE"
+PROFILE_DIR_ENV = "DOMINOSA_PROFILE_DIR"
+MODES = ("cprofile", "sample")
+SAMPLE_INTERVAL = 0.001
+
+_mode: Optional[str] = None
+_out_dir = "profiles"
+_counter = itertools.count(1)
+_registry: List[Tuple[Callable, str, Optional[Callable]]] = []
+_active = threading.local()
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _pstats_label(func) -> str:
+    filename, line, name = func
+    return f"{name} ({os.path.basename(filename)}:{line})"
+
+
+def collapse_pstats(stats: pstats.Stats) -> Dict[str, float]:
+    # cProfile only keeps caller/callee pairs, so full stacks are rebuilt by
+    # splitting each function's time across its callers; recursion is folded.
+    callees: Dict[tuple, List[tuple]] = {}
+    for func, (_, _, _, _, callers) in stats.stats.items():
+        for caller in callers:
+            callees.setdefault(caller, []).append(func)
+
+    stacks: Dict[str, float] = {}
+
+    def walk(func, path: List[str], seen: set, share: float):
+        _, _, tt, ct, _ = stats.stats[func]
+        path = path + [_pstats_label(func)]
+        if tt * share > 0:
+            key = ";".join(path)
+            stacks[key] = stacks.get(key, 0.0) + tt * share
+        for callee in callees.get(func, ()):
+            if callee in seen:
+                continue
+            edge_ct = stats.stats[callee][4][func][3]
+            total_ct = stats.stats[callee][3] or 1.0
+            walk(callee, path, seen | {callee}, share * edge_ct / total_ct)
+
+    roots = [f for f, entry in stats.stats.items() if not entry[4]]
+    for root in roots:
+        walk(root, [], {root}, 1.0)
+    return stacks
+
+
+def write_collapsed(stacks: Dict[str, float], path: str, scale: float = 1.0):
+    with open(path, "w") as fh:
+        for stack, weight in sorted(stacks.items()):
+            count = int(round(weight * scale))
+            if count > 0:
+                fh.write(f"{stack} {count}\n")
+
+
+class StackSampler(threading.Thread):
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples: Counter = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                stack.append(_frame_label(frame.f_code))
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def _output_base(label: str) -> str:
+    os.makedirs(_out_dir, exist_ok=True)
+    return os.path.join(_out_dir, f"{label}-{os.getpid()}-{next(_counter):05d}")
+
+
+def _wrap(func: Callable, label: str, detail: Optional[Callable]) -> Callable:
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        if getattr(_active, "depth", 0):
+            return func(*args, **kwargs)
+        _active.depth = 1
+        try:
+            return _profile_call(func, label, detail, args, kwargs)
+        finally:
+            _active.depth = 0
+
+    return wrapper
+
+
+def _profile_call(func: Callable, label: str, detail: Optional[Callable], args, kwargs):
+    name = label
+    if detail is not None:
+        name = f"{label}-{detail(*args, **kwargs)}"
+
+    if _mode == "sample":
+        sampler = StackSampler(threading.get_ident())
+        sampler.start()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            sampler.stop()
+            write_collapsed(dict(sampler.samples), _output_base(name) + ".folded")
+
+    profiler = cProfile.Profile()
+    try:
+        return profiler.runcall(func, *args, **kwargs)
+    finally:
+        base = _output_base(name)
+        profiler.dump_stats(base + ".prof")
+        # Weights are microseconds so that flamegraph widths track time.
+        write_collapsed(collapse_pstats(pstats.Stats(profiler)), base + ".folded", 1e6)
+
+
+def profiled(label: str, detail: Optional[Callable] = None) -> Callable:
+    def decorate(func: Callable) -> Callable:
+        _registry.append((func, label, detail))
+        if _mode is None:
+            return func
+        return _wrap(func, label, detail)
+    return decorate
+
+
+def enable(mode: str = "cprofile", out_dir: Optional[str] = None):
+    global _mode, _out_dir
+    if mode not in MODES:
+        raise ValueError(f"Unknown profiling mode '{mode}', expected one of {MODES}")
+    was_enabled = _mode is not None
+    _mode = mode
+    if out_dir:
+        _out_dir = out_dir
+    if was_enabled:
+        return
+
+    # Hooks decorated before enable() were left unwrapped; rebind them
+    # everywhere they are referenced (classes and `from x import f` names).
+    wrapped = {id(func): (func, _wrap(func, label, detail)) for func, label, detail in _registry}
+    for module in list(sys.modules.values()):
+        namespace = getattr(module, "__dict__", None)
+        if not isinstance(namespace, dict):
+            continue
+        owners = [module] + [v for v in list(namespace.values())
+                             if isinstance(v, type) and v.__module__ == module.__name__]
+        for owner in owners:
+            for attr, value in list(vars(owner).items()):
+                hit = wrapped.get(id(value))
+                if hit is not None and hit[0] is value:
+                    setattr(owner, attr, hit[1])
+
+
+def configure_from_args(argv: List[str]) -> List[str]:
+    remaining = []
+    for arg in argv:
+        if arg == "--profile":
+            enable(os.environ.get(PROFILE_ENV) or "cprofile", os.environ.get(PROFILE_DIR_ENV))
+        elif arg.startswith("--profile="):
+            enable(arg.split("=", 1)[1], os.environ.get(PROFILE_DIR_ENV))
+        else:
+            remaining.append(arg)
+    return remaining
+
+
+if os.environ.get(PROFILE_ENV):
+    _mode = os.environ[PROFILE_ENV] if os.environ[PROFILE_ENV] in MODES else "cprofile"
+    _out_dir = os.environ.get(PROFILE_DIR_ENV, _out_dir)
@@ -0,0 +1,224 @@
+import argparse
+import glob
+import json
+import os
+import struct
+import time
+from dataclasses import asdict, dataclass, field
+from typing import BinaryIO, Dict, List, Optional, Sequence, Tuple
+
+from board import DominosaBoard
+from solver import SolverEngine, STRATEGIES
+
+MAGIC = b"DMSR"
+VERSION = 2
+DEFAULT_TIME_BUDGET = 1.0
+RECORD_SUFFIX = ".dsr"
+RECORD_DIR_ENV = "DOMINOSA_RECORD_DIR"
+HUMAN = "HUMAN"
+
+_HEADER = struct.Struct("<4sBBBq")
+# Version 2 adds the engines' time budget so AI plies replay under the same limit.
+_BUDGET = struct.Struct("<d")
+_MOVE = struct.Struct("<H")
+REMOVAL_BIT = 0x8000
+OWNER2_BIT = 0x4000
+EDGE_MASK = 0x3FFF
+
+
+@dataclass
+class GameRecord:
+    matrix: List[List[int]]
+    seed: int
+    strategies: Tuple[str, ...]
+    moves: List[Tuple[int, int]] = field(default_factory=list)
+    time_budget: float = DEFAULT_TIME_BUDGET
+
+
+@dataclass
+class PlyTiming:
+    ply: int
+    owner: int
+    strategy: str
+    recorded: int
+    replayed: int
+    wall_time: float
+    nodes: int
+
+
+def pack_move(edge_idx: int, owner: int) -> bytes:
+    if not 0 <= edge_idx <= EDGE_MASK:
+        raise ValueError(f"Edge index {edge_idx} does not fit a move record")
+    if owner == 0:
+        return _MOVE.pack(edge_idx | REMOVAL_BIT)
+    return _MOVE.pack(edge_idx | (OWNER2_BIT if owner == 2 else 0))
+
+
+def unpack_move(word: int) -> Tuple[int, int]:
+    if word & REMOVAL_BIT:
+        return word & EDGE_MASK, 0
+    return word & EDGE_MASK, 2 if word & OWNER2_BIT else 1
+
+
+class GameRecorder:
+    # Moves are flushed as they are played so that a crashed or killed
+    # session still leaves a readable record of everything up to that point.
+    def __init__(self, stream: BinaryIO, matrix: List[List[int]], seed: int, strategies: Sequence[str],
+                 time_budget: float = DEFAULT_TIME_BUDGET):
+        self.stream = stream
+        self.moves = 0
+        rows, cols = len(matrix), len(matrix[0])
+        header = [_HEADER.pack(MAGIC, VERSION, rows, cols, seed), _BUDGET.pack(time_budget),
+                  bytes([len(strategies)])]
+        for name in strategies:
+            encoded = name.encode()
+            header.append(bytes([len(encoded)]) + encoded)
+        header.append(bytes(v for row in matrix for v in row))
+        self.stream.write(b"".join(header))
+        self.stream.flush()
+
+    @classmethod
+    def open(cls, path: str, matrix: List[List[int]], seed: int, strategies: Sequence[str],
+             time_budget: float = DEFAULT_TIME_BUDGET) -> 'GameRecorder':
+        return cls(open(path, "wb"), matrix, seed, strategies, time_budget)
+
+    def record(self, edge_idx: int, owner: int):
+        self.stream.write(pack_move(edge_idx, owner))
+        self.stream.flush()
+        self.moves += 1
+
+    def record_removal(self, edge_idx: int):
+        self.record(edge_idx, 0)
+
+    def close(self):
+        self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def new_record_path(directory: Optional[str] = None, tag: str = "game") -> str:
+    directory = directory or os.environ.get(RECORD_DIR_ENV, "records")
+    os.makedirs(directory, exist_ok=True)
+    stamp = time.strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"{tag}-{stamp}-{os.getpid()}-{time.perf_counter_ns() % 1000000:06d}{RECORD_SUFFIX}")
+
+
+def parse_record(data: bytes) -> GameRecord:
+    if len(data) < _HEADER.size:
+        raise ValueError("Record is truncated")
+    magic, version, rows, cols, seed = _HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a Dominosa game record")
+    if version not in (1, VERSION):
+        raise ValueError(f"Unsupported record version {version}")
+
+    pos = _HEADER.size
+    time_budget = DEFAULT_TIME_BUDGET
+    if version >= 2:
+        if len(data) < pos + _BUDGET.size:
+            raise ValueError("Record is truncated")
+        time_budget, = _BUDGET.unpack_from(data, pos)
+        pos += _BUDGET.size
+    strategies = []
+    for _ in range(data[pos]):
+        length = data[pos + 1]
+        strategies.append(data[pos + 2:pos + 2 + length].decode())
+        pos += 1 + length
+    pos += 1
+
+    cells = data[pos:pos + rows * cols]
+    if len(cells) != rows * cols:
+        raise ValueError("Record is truncated")
+    matrix = [list(cells[r * cols:(r + 1) * cols]) for r in range(rows)]
+    pos += rows * cols
+
+    # A torn final write leaves half a move; everything before it is kept.
+    end = pos + (len(data) - pos) // _MOVE.size * _MOVE.size
+    moves = [unpack_move(word) for (word,) in _MOVE.iter_unpack(data[pos:end])]
+    return GameRecord(matrix, seed, tuple(strategies), moves, time_budget)
+
+
+def read_record(path: str) -> GameRecord:
+    with open(path, "rb") as fh:
+        return parse_record(fh.read())
+
+
+def apply_recorded_move(board: DominosaBoard, edge_idx: int, owner: int):
+    edge = board.edges[edge_idx]
+    if owner == 0:
+        board.remove_edge(edge)
+    elif not board.confirm_edge(edge, owner):
+        raise ValueError(f"Recorded move on edge {edge_idx} is illegal in this position")
+
+
+def replay(record: GameRecord, plies: Optional[Sequence[int]] = None, strategy: Optional[str] = None,
+           time_budget: Optional[float] = None) -> List[PlyTiming]:
+    if time_budget is None:
+        time_budget = record.time_budget
+    board = DominosaBoard(record.matrix)
+    engines: Dict[int, SolverEngine] = {}
+    wanted = None if plies is None else set(plies)
+    timings = []
+
+    for ply, (edge_idx, owner) in enumerate(record.moves):
+        name = strategy or (record.strategies[owner - 1] if 0 < owner <= len(record.strategies) else HUMAN)
+        if owner and name in STRATEGIES and (wanted is None or ply in wanted):
+            if owner not in engines:
+                engines[owner] = SolverEngine(board.fork(), time_budget)
+            engine = engines[owner]
+            start = time.perf_counter()
+            move, _ = engine.solve_next_step(name, board.snapshot())
+            elapsed = time.perf_counter() - start
+            timings.append(PlyTiming(ply, owner, name, edge_idx, move.index if move else -1,
+                                     elapsed, engine.stats.nodes_expanded))
+        apply_recorded_move(board, edge_idx, owner)
+    return timings
+
+
+def summarize(timings: List[PlyTiming]) -> Dict:
+    if not timings:
+        return {"plies": 0, "total_ms": 0.0, "slowest": None, "mismatches": 0}
+    slowest = max(timings, key=lambda t: t.wall_time)
+    return {"plies": len(timings),
+            "total_ms": round(sum(t.wall_time for t in timings) * 1000, 3),
+            "slowest": {"ply": slowest.ply, "strategy": slowest.strategy,
+                        "ms": round(slowest.wall_time * 1000, 3), "nodes": slowest.nodes},
+            "mismatches": sum(t.recorded != t.replayed for t in timings)}
+
+
+def _expand(paths: Sequence[str]) -> List[str]:
+    found = []
+    for path in paths:
+        if os.path.isdir(path):
+            found.extend(sorted(glob.glob(os.path.join(path, "*" + RECORD_SUFFIX))))
+        else:
+            found.append(path)
+    return found
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay recorded Dominosa games and time every engine move")
+    parser.add_argument("paths", nargs="+", help="record files or directories of records")
+    parser.add_argument("--ply", type=int, nargs="+", help="only re-run these plies")
+    parser.add_argument("--strategy", choices=STRATEGIES, help="re-run every ply with this strategy")
+    parser.add_argument("--time-budget", type=float, help="override the budget stored in each record")
+    parser.add_argument("--json", help="write per-ply timings for every record to this file")
+    args = parser.parse_args()
+
+    corpus = {}
+    for path in _expand(args.paths):
+        record = read_record(path)
+        timings = replay(record, args.ply, args.strategy, args.time_budget)
+        report = summarize(timings)
+        corpus[path] = {"summary": report, "plies": [asdict(t) for t in timings]}
+        slow = report["slowest"]
+        print(f"{path}: {len(record.moves)} moves, {report['plies']} replayed, {report['total_ms']:.1f} ms"
+              + (f", slowest ply {slow['ply']} {slow['strategy']} {slow['ms']:.1f} ms" if slow else "")
+              + (f", {report['mismatches']} moves differ" if report["mismatches"] else ""))
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(corpus, fh, indent=2)
@@ -0,0 +1,378 @@
+import argparse
+import heapq
+import io
+import itertools
+import sys
+import time
+from typing import Callable, Dict, IO, List, Optional, Sequence
+
+from board import DominosaBoard
+
+PAIRWISE_MAX = 4
+RESTART_UNIT = 100
+VAR_DECAY = 0.95
+LEARNT_START = 2000
+LEARNT_GROWTH = 1.1
+STOP_CHECK_MASK = 255
+HEAP_SLACK = 4
+
+SAT, UNSAT, RESTART, STOPPED = 1, 0, -1, -2
+
+
+class CNF:
+    # Variables 1..len(edge_vars) are edges; counter variables come after.
+    def __init__(self):
+        self.num_vars = 0
+        self.clauses: List[List[int]] = []
+        self.edge_vars: Dict[int, int] = {}
+        self.var_edges: Dict[int, int] = {}
+
+    def new_var(self) -> int:
+        self.num_vars += 1
+        return self.num_vars
+
+    def add_edge(self, edge_idx: int) -> int:
+        var = self.new_var()
+        self.edge_vars[edge_idx] = var
+        self.var_edges[var] = edge_idx
+        return var
+
+    def at_most_one(self, lits: Sequence[int]):
+        # Pairwise is smaller up to four literals; past that a sequential
+        # counter keeps it linear: s_i means "one of x_1..x_i is true".
+        if len(lits) <= PAIRWISE_MAX:
+            self.clauses.extend([-a, -b] for a, b in itertools.combinations(lits, 2))
+            return
+        prev = self.new_var()
+        self.clauses.append([-lits[0], prev])
+        for x in lits[1:-1]:
+            cur = self.new_var()
+            self.clauses.append([-x, cur])
+            self.clauses.append([-prev, cur])
+            self.clauses.append([-x, -prev])
+            prev = cur
+        self.clauses.append([-lits[-1], -prev])
+
+    def exactly_one(self, lits: Sequence[int]):
+        self.clauses.append(list(lits))
+        self.at_most_one(lits)
+
+    def write_dimacs(self, out: IO[str]):
+        out.write(f"c Dominosa exact cover, {len(self.edge_vars)} edge variables\n")
+        for var, edge_idx in self.var_edges.items():
+            out.write(f"c edge {edge_idx} {var}\n")
+        out.write(f"p cnf {self.num_vars} {len(self.clauses)}\n")
+        for clause in self.clauses:
+            out.write(" ".join(map(str, clause)) + " 0\n")
+
+    def to_dimacs(self) -> str:
+        buf = io.StringIO()
+        self.write_dimacs(buf)
+        return buf.getvalue()
+
+
+def encode(board: DominosaBoard) -> CNF:
+    # Only edges still placeable in this position get a variable. Every free
+    # cell and every unplaced pair must then be covered exactly once.
+    cnf = CNF()
+    occ, avail = board.occupancy_mask, board.available_mask
+    by_cell: Dict[int, List[int]] = {}
+    by_pair: Dict[int, List[int]] = {}
+    for idx, cell_bits in enumerate(board.edge_cell_bits):
+        pair_bit = board.edge_pair_bits[idx]
+        if cell_bits & occ or not pair_bit & avail:
+            continue
+        var = cnf.add_edge(idx)
+        low = cell_bits & -cell_bits
+        by_cell.setdefault(low, []).append(var)
+        by_cell.setdefault(cell_bits ^ low, []).append(var)
+        by_pair.setdefault(pair_bit, []).append(var)
+
+    free = ~occ & ((1 << (board.rows * board.cols)) - 1)
+    while free:
+        bit = free & -free
+        free ^= bit
+        cnf.exactly_one(by_cell.get(bit, ()))
+    while avail:
+        bit = avail & -avail
+        avail ^= bit
+        cnf.exactly_one(by_pair.get(bit, ()))
+    return cnf
+
+
+def _luby(i: int) -> int:
+    size, seq = 1, 0
+    while size < i + 1:
+        seq += 1
+        size = 2 * size + 1
+    while size - 1 != i:
+        size = (size - 1) >> 1
+        seq -= 1
+        i %= size
+    return 1 << seq
+
+
+class CDCLSolver:
+    # Literal codes: 2v for v, 2v+1 for -v. Two watched literals per clause,
+    # first-UIP learning with backjumping, VSIDS with phase saving, Luby
+    # restarts, and the longer half of learnt clauses dropped as they pile up.
+    def __init__(self, num_vars: int, clauses: Sequence[Sequence[int]]):
+        self.num_vars = num_vars
+        self.val = [0] * (2 * num_vars + 2)
+        self.level = [0] * (num_vars + 1)
+        self.reason = [-1] * (num_vars + 1)
+        self.phase = [1] * (num_vars + 1)
+        self.activity = [0.0] * (num_vars + 1)
+        self.seen = bytearray(num_vars + 1)
+        self.var_inc = 1.0
+        self.heap = [(0.0, v) for v in range(1, num_vars + 1)]
+        self.watches: List[List[int]] = [[] for _ in range(2 * num_vars + 2)]
+        self.clauses: List[Optional[List[int]]] = []
+        self.learnts: List[int] = []
+        self.max_learnts = LEARNT_START
+        self.trail: List[int] = []
+        self.trail_lim: List[int] = []
+        self.qhead = 0
+        self.conflicts = 0
+        self.decisions = 0
+        self.unsat = False
+
+        for clause in clauses:
+            lits = sorted({2 * abs(x) + (x < 0) for x in clause})
+            if any(lits[i] ^ 1 == lits[i + 1] for i in range(len(lits) - 1)):
+                continue
+            if not lits:
+                self.unsat = True
+            elif len(lits) == 1:
+                if self.val[lits[0]] == -1:
+                    self.unsat = True
+                elif not self.val[lits[0]]:
+                    self._enqueue(lits[0], -1)
+            else:
+                self._attach(lits)
+
+    def _attach(self, lits: List[int]) -> int:
+        ci = len(self.clauses)
+        self.clauses.append(lits)
+        self.watches[lits[0]].append(ci)
+        self.watches[lits[1]].append(ci)
+        return ci
+
+    def _enqueue(self, lit: int, reason: int):
+        self.val[lit] = 1
+        self.val[lit ^ 1] = -1
+        var = lit >> 1
+        self.level[var] = len(self.trail_lim)
+        self.reason[var] = reason
+        self.trail.append(lit)
+
+    def _propagate(self) -> int:
+        val, clauses, watches, trail = self.val, self.clauses, self.watches, self.trail
+        while self.qhead < len(trail):
+            false_lit = trail[self.qhead] ^ 1
+            self.qhead += 1
+            ws = watches[false_lit]
+            i = j = 0
+            end = len(ws)
+            while i < end:
+                ci = ws[i]
+                i += 1
+                c = clauses[ci]
+                if c is None:
+                    continue
+                if c[0] == false_lit:
+                    c[0], c[1] = c[1], false_lit
+                first = c[0]
+                if val[first] == 1:
+                    ws[j] = ci
+                    j += 1
+                    continue
+                for k in range(2, len(c)):
+                    if val[c[k]] != -1:
+                        c[1], c[k] = c[k], false_lit
+                        watches[c[1]].append(ci)
+                        break
+                else:
+                    ws[j] = ci
+                    j += 1
+                    if val[first] == -1:
+                        ws[j:] = ws[i:end]
+                        self.qhead = len(trail)
+                        return ci
+                    self._enqueue(first, ci)
+            del ws[j:]
+        return -1
+
+    def _bump(self, var: int):
+        self.activity[var] += self.var_inc
+        if self.activity[var] > 1e100:
+            self.activity = [a * 1e-100 for a in self.activity]
+            self.var_inc *= 1e-100
+            self._rebuild_heap()
+        elif not self.val[2 * var]:
+            heapq.heappush(self.heap, (-self.activity[var], var))
+
+    def _rebuild_heap(self):
+        # Entries are pushed lazily and never removed in place, so the heap
+        # is rebuilt from the unassigned variables when it grows too large.
+        self.heap = [(-self.activity[v], v) for v in range(1, self.num_vars + 1) if not self.val[2 * v]]
+        heapq.heapify(self.heap)
+
+    def _analyze(self, confl: int):
+        seen, level, trail = self.seen, self.level, self.trail
+        current = len(self.trail_lim)
+        learnt = [0]
+        pending, lit, idx = 0, -1, len(trail) - 1
+        while True:
+            clause = self.clauses[confl]
+            for q in (clause if lit < 0 else clause[1:]):
+                var = q >> 1
+                if not seen[var] and level[var] > 0:
+                    seen[var] = 1
+                    self._bump(var)
+                    if level[var] >= current:
+                        pending += 1
+                    else:
+                        learnt.append(q)
+            while not seen[trail[idx] >> 1]:
+                idx -= 1
+            lit = trail[idx]
+            idx -= 1
+            seen[lit >> 1] = 0
+            pending -= 1
+            if not pending:
+                break
+            confl = self.reason[lit >> 1]
+
+        learnt[0] = lit ^ 1
+        for q in learnt[1:]:
+            seen[q >> 1] = 0
+        if len(learnt) == 1:
+            return learnt, 0
+        hi = max(range(1, len(learnt)), key=lambda i: level[learnt[i] >> 1])
+        learnt[1], learnt[hi] = learnt[hi], learnt[1]
+        return learnt, level[learnt[1] >> 1]
+
+    def _cancel_until(self, target: int):
+        if len(self.trail_lim) <= target:
+            return
+        start = self.trail_lim[target]
+        for lit in self.trail[start:]:
+            var = lit >> 1
+            self.val[lit] = self.val[lit ^ 1] = 0
+            self.reason[var] = -1
+            self.phase[var] = lit & 1
+            heapq.heappush(self.heap, (-self.activity[var], var))
+        del self.trail[start:]
+        del self.trail_lim[target:]
+        self.qhead = start
+        if len(self.heap) > HEAP_SLACK * self.num_vars:
+            self._rebuild_heap()
+
+    def _pick_branch(self) -> int:
+        heap, val = self.heap, self.val
+        while heap:
+            _, var = heapq.heappop(heap)
+            if not val[2 * var]:
+                return var
+        return 0
+
+    def _locked(self, ci: int) -> bool:
+        first = self.clauses[ci][0]
+        return self.val[first] == 1 and self.reason[first >> 1] == ci
+
+    def _reduce_learnts(self):
+        ranked = sorted(self.learnts, key=lambda ci: -len(self.clauses[ci]))
+        drop = set()
+        for ci in ranked[:len(ranked) // 2]:
+            if len(self.clauses[ci]) > 2 and not self._locked(ci):
+                self.clauses[ci] = None
+                drop.add(ci)
+        self.learnts = [ci for ci in self.learnts if ci not in drop]
+        self.max_learnts = int(self.max_learnts * LEARNT_GROWTH)
+
+    def _search(self, budget: int, should_stop: Optional[Callable[[], bool]]) -> int:
+        conflicts = 0
+        while True:
+            confl = self._propagate()
+            if confl >= 0:
+                self.conflicts += 1
+                conflicts += 1
+                if not self.trail_lim:
+                    return UNSAT
+                learnt, back = self._analyze(confl)
+                self._cancel_until(back)
+                if len(learnt) == 1:
+                    self._enqueue(learnt[0], -1)
+                else:
+                    ci = self._attach(learnt)
+                    self.learnts.append(ci)
+                    self._enqueue(learnt[0], ci)
+                self.var_inc /= VAR_DECAY
+                if should_stop is not None and conflicts & STOP_CHECK_MASK == 0 and should_stop():
+                    return STOPPED
+                continue
+
+            if conflicts >= budget:
+                self._cancel_until(0)
+                return RESTART
+            if len(self.learnts) - len(self.trail) >= self.max_learnts:
+                self._reduce_learnts()
+            var = self._pick_branch()
+            if not var:
+                return SAT
+            self.decisions += 1
+            self.trail_lim.append(len(self.trail))
+            self._enqueue(2 * var + self.phase[var], -1)
+
+    def solve(self, should_stop: Optional[Callable[[], bool]] = None) -> Optional[bool]:
+        # True or False when decided, None when stopped from outside.
+        if self.unsat or self._propagate() >= 0:
+            self.unsat = True
+            return False
+        for restart in itertools.count():
+            status = self._search(_luby(restart) * RESTART_UNIT, should_stop)
+            if status == SAT:
+                return True
+            if status == UNSAT:
+                self.unsat = True
+                return False
+            if status == STOPPED or (should_stop is not None and should_stop()):
+                self._cancel_until(0)
+                return None
+
+    def model(self) -> List[int]:
+        return [v for v in range(1, self.num_vars + 1) if self.val[2 * v] == 1]
+
+
+def solve_board(board: DominosaBoard, should_stop: Optional[Callable[[], bool]] = None):
+    # Returns (verdict, edge indices of a completing tiling, solver).
+    cnf = encode(board)
+    solver = CDCLSolver(cnf.num_vars, cnf.clauses)
+    verdict = solver.solve(should_stop)
+    edges = [cnf.var_edges[v] for v in solver.model() if v in cnf.var_edges] if verdict else []
+    return verdict, edges, solver
+
+
+if __name__ == "__main__":
+    from formats import iter_file
+
+    parser = argparse.ArgumentParser(description="Encode Dominosa boards as CNF, export DIMACS and solve with CDCL")
+    parser.add_argument("input", help="file of game IDs and/or grids, .gz or '-' for stdin")
+    parser.add_argument("--dimacs", help="write the CNF of the first board to this file ('-' for stdout)")
+    args = parser.parse_args()
+
+    for n, (line_no, matrix) in enumerate(iter_file(args.input)):
+        board = DominosaBoard(matrix)
+        if n == 0 and args.dimacs:
+            cnf = encode(board)
+            if args.dimacs == "-":
+                cnf.write_dimacs(sys.stdout)
+            else:
+                with open(args.dimacs, "w") as fh:
+                    cnf.write_dimacs(fh)
+        start = time.perf_counter()
+        verdict, edges, solver = solve_board(board)
+        print(f"line {line_no}: Double-{len(matrix) - 1} {'SAT' if verdict else 'UNSAT'}, "
+              f"{solver.num_vars} vars, {len(solver.clauses)} clauses, {solver.conflicts} conflicts, "
+              f"{(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
@@ -0,0 +1,286 @@
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import random
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from board import DominosaBoard
+from formats import check_matrix
+from generator import build_valid_matrix
+from memory import MEMORY_LIMIT_ENV, parse_size
+from solver import SolverEngine, STRATEGIES
+from structures import BoardSnapshot
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+OPS = ("hint", "solve", "validate", "generate")
+
+
+class ServiceError(Exception):
+    pass
+
+
+def _edge_json(board: DominosaBoard, idx: int) -> Dict[str, Any]:
+    e = board.edges[idx]
+    return {"edge": idx, "a": [e.node_a.r, e.node_a.c], "b": [e.node_b.r, e.node_b.c]}
+
+
+def _parse_snapshot(payload: Dict[str, Any]) -> BoardSnapshot:
+    matrix = payload.get("matrix")
+    if not matrix or not all(isinstance(row, list) and row for row in matrix):
+        raise ServiceError("'matrix' must be a non-empty list of rows")
+    if len({len(row) for row in matrix}) != 1:
+        raise ServiceError("'matrix' rows must all have the same length")
+    placements = tuple((int(idx), int(owner)) for idx, owner in payload.get("placements", []))
+    rows, cols = len(matrix), len(matrix[0])
+    edge_count = rows * (cols - 1) + (rows - 1) * cols
+    for idx, _ in placements:
+        if not 0 <= idx < edge_count:
+            raise ServiceError(f"Placement edge {idx} is outside 0..{edge_count - 1}")
+    return BoardSnapshot(tuple(tuple(int(v) for v in row) for row in matrix), placements)
+
+
+def _run_job(op: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    if op == "generate":
+        n = int(payload.get("n", 4))
+        seed = payload.get("seed")
+        return {"matrix": build_valid_matrix(n, random.Random(seed))}
+
+    snapshot = _parse_snapshot(payload)
+    board = DominosaBoard.from_snapshot(snapshot)
+    # from_snapshot skips placements that overlap or reuse a pair.
+    legal = len(board.placements) == len(snapshot.placements)
+    if not legal and op != "validate":
+        raise ServiceError("'placements' overlap or place a domino twice")
+    engine = SolverEngine(board)
+    strategy = payload.get("strategy", "DYNAMIC_PROGRAMMING")
+
+    if op == "hint":
+        move, reason = engine.solve_next_step(strategy)
+        return {"move": _edge_json(board, move.index) if move else None,
+                "reason": reason, "nodes": engine.nodes_visited, "peak_bytes": engine.stats.memory_peak}
+
+    if op == "validate":
+        try:
+            check_matrix(board.matrix_key)
+            well_formed = True
+        except ValueError:
+            well_formed = False
+        solvable = board.get_progress() >= 1.0
+        if well_formed and legal and not solvable:
+            solvable = engine.solve_next_step("DYNAMIC_PROGRAMMING")[0] is not None
+            if engine.memory_exhausted:
+                solvable = None
+        return {"well_formed": well_formed, "legal": legal,
+                "solvable": well_formed and legal and solvable, "progress": board.get_progress()}
+
+    moves = []
+    while board.get_progress() < 1.0:
+        move, reason = engine.solve_next_step(strategy)
+        if move is None:
+            return {"solved": False, "moves": moves, "reason": reason}
+        board.confirm_edge(move, 1)
+        moves.append(_edge_json(board, move.index))
+    return {"solved": True, "moves": moves}
+
+
+class SolverService:
+    def __init__(self, executor: Optional[Executor] = None, workers: Optional[int] = None,
+                 cache_size: int = 1024, latency_window: int = 1000):
+        self.workers = workers or os.cpu_count() or 1
+        # Forked workers would inherit open client sockets and hold them open.
+        self.executor = executor or ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self.cache: "OrderedDict[Tuple, Dict[str, Any]]" = OrderedDict()
+        self.cache_size = cache_size
+        self.in_flight: Dict[Tuple, asyncio.Future] = {}
+        self.slots = asyncio.Semaphore(self.workers)
+
+        self.queued = 0
+        self.running = 0
+        self.requests = 0
+        self.cache_hits = 0
+        self.coalesced = 0
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+
+    def _request_key(self, op: str, payload: Dict[str, Any]) -> Optional[Tuple]:
+        if op == "generate":
+            if payload.get("seed") is None:
+                return None
+            return (op, int(payload.get("n", 4)), payload["seed"])
+        snapshot = _parse_snapshot(payload)
+        return (op, snapshot.matrix, tuple(sorted(snapshot.placements)),
+                payload.get("strategy", "DYNAMIC_PROGRAMMING"))
+
+    def _remember(self, key: Tuple, result: Dict[str, Any]):
+        # Answers cut short by a worker's memory budget say nothing about the board.
+        if result.get("solvable", False) is None or str(result.get("reason", "")).startswith("Memory Budget"):
+            return
+        self.cache[key] = result
+        self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+
+    async def _execute(self, op: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.queued += 1
+        async with self.slots:
+            self.queued -= 1
+            self.running += 1
+            try:
+                loop = asyncio.get_running_loop()
+                return await loop.run_in_executor(self.executor, _run_job, op, payload)
+            finally:
+                self.running -= 1
+
+    async def submit(self, op: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if op not in OPS:
+            raise ServiceError(f"Unknown op '{op}'")
+        strategy = payload.get("strategy", "DYNAMIC_PROGRAMMING")
+        if op in ("hint", "solve") and strategy not in STRATEGIES:
+            raise ServiceError(f"Unknown strategy '{strategy}'")
+
+        self.requests += 1
+        key = self._request_key(op, payload)
+        if key is None:
+            return await self._execute(op, payload)
+
+        if key in self.cache:
+            self.cache_hits += 1
+            self.cache.move_to_end(key)
+            return self.cache[key]
+
+        pending = self.in_flight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+
+        pending = asyncio.ensure_future(self._execute(op, payload))
+        self.in_flight[key] = pending
+        try:
+            result = await asyncio.shield(pending)
+        finally:
+            self.in_flight.pop(key, None)
+        self._remember(key, result)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+
+        def pct(p):
+            if not ordered: return 0.0
+            return round(ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000, 3)
+
+        return {"queue_depth": self.queued, "running": self.running, "workers": self.workers,
+                "requests": self.requests, "cache_hits": self.cache_hits,
+                "coalesced": self.coalesced, "cache_size": len(self.cache),
+                "latency_ms": {"p50": pct(0.50), "p95": pct(0.95), "p99": pct(0.99)}}
+
+    async def handle(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        reply: Dict[str, Any] = {"id": message.get("id")}
+        op = message.get("op")
+        if op == "stats":
+            reply["result"] = self.stats()
+            return reply
+
+        start = time.perf_counter()
+        try:
+            reply["result"] = await self.submit(op, message)
+        except (ServiceError, ValueError, TypeError, KeyError) as exc:
+            reply["error"] = str(exc)
+        except Exception as exc:
+            # Anything else a job raises still gets a reply instead of a hang.
+            reply["error"] = f"{type(exc).__name__}: {exc}"
+        self.latencies.append(time.perf_counter() - start)
+        return reply
+
+    async def _serve_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        lock = asyncio.Lock()
+
+        async def answer(line: bytes):
+            try:
+                message = json.loads(line)
+                if not isinstance(message, dict):
+                    raise ValueError("Request must be a JSON object")
+            except ValueError as exc:
+                reply = {"id": None, "error": f"Bad request: {exc}"}
+            else:
+                reply = await self.handle(message)
+            async with lock:
+                writer.write(json.dumps(reply).encode() + b"\n")
+                await writer.drain()
+
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                task = asyncio.ensure_future(answer(line))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                    unix_path: Optional[str] = None) -> asyncio.AbstractServer:
+        if unix_path:
+            return await asyncio.start_unix_server(self._serve_client, path=unix_path)
+        return await asyncio.start_server(self._serve_client, host, port)
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def request(message: Dict[str, Any], host: str = DEFAULT_HOST, port: int = DEFAULT_PORT,
+                  unix_path: Optional[str] = None) -> Dict[str, Any]:
+    if unix_path:
+        reader, writer = await asyncio.open_unix_connection(unix_path)
+    else:
+        reader, writer = await asyncio.open_connection(host, port)
+    try:
+        writer.write(json.dumps(message).encode() + b"\n")
+        await writer.drain()
+        return json.loads(await reader.readline())
+    finally:
+        writer.close()
+
+
+async def _main(args):
+    service = SolverService(workers=args.workers, cache_size=args.cache_size)
+    server = await service.serve(args.host, args.port, args.unix)
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Dominosa solver service listening on {where} with {service.workers} workers")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local JSON-lines Dominosa solver service")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", help="listen on a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--memory-limit", type=parse_size, help="per-worker engine memory budget, e.g. 512M")
+    args = parser.parse_args()
+    if args.memory_limit:
+        # Spawned workers inherit the environment and read the budget from it.
+        os.environ[MEMORY_LIMIT_ENV] = str(args.memory_limit)
+    try:
+        asyncio.run(_main(args))
+    except KeyboardInterrupt:
+        pass
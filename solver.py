@@ -1,27 +1,169 @@
-from structures import BondState, CellNode, EdgeBond
-from board import DominosaBoard
-from typing import List, Tuple, Optional, Dict, Set, FrozenSet
+import time
+
+from structures import BondState, BoardSnapshot, EdgeBond
+from board import LAST_MOVER_LOSES, DominosaBoard
+from gametable import GameTable
+from memory import CHECK_MASK, EVICT_FRACTION, MemoryBudget
+from ordering import MoveOrdering
+from profiling import profiled
+from sat import solve_board
+from stats import SolveStats, StatsSink
+from ttstore import KIND_BEST_MOVE, KIND_VERDICT, TTStore, board_fingerprint
+from typing import Iterator, List, Tuple, Optional, Dict, Set
+
+STRATEGIES = ["GREEDY", "PROBING", "DIVIDE_CONQUER", "DYNAMIC_PROGRAMMING", "BACKTRACKING", "ADVERSARIAL",
+              "PORTFOLIO", "SAT"]
+
+BATCH_TILING_MIN = 4
+
+DC_BASE_CELLS = 8
+DC_MEMO_LIMIT = 200000
+
+WIN_SCORE = 1000
+TT_EXACT, TT_LOWER, TT_UPPER = 0, 1, 2
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+def count_solutions(board: DominosaBoard, limit: int = 2) -> int:
+    W = board.cols
+    full = (1 << (board.rows * W)) - 1
+    pair_bits = len(board.pair_index)
+
+    options: Dict[int, List[Tuple[int, int]]] = {}
+    for e in board.edges:
+        a, b = e.node_a.r * W + e.node_a.c, e.node_b.r * W + e.node_b.c
+        lo, hi = min(a, b), max(a, b)
+        options.setdefault(lo, []).append((1 << hi, board.edge_pair_bits[e.index]))
+
+    memo: Dict[int, int] = {}
+
+    def count(occ: int, avail: int) -> int:
+        if occ == full:
+            return 1
+        key = (occ << pair_bits) | avail
+        hit = memo.get(key)
+        if hit is not None:
+            return hit
+
+        free = ~occ & full
+        idx = (free & -free).bit_length() - 1
+        total = 0
+        for other_bit, pair_bit in options.get(idx, ()):
+            if not occ & other_bit and avail & pair_bit:
+                total += count(occ | (1 << idx) | other_bit, avail & ~pair_bit)
+                if total >= limit:
+                    total = limit
+                    break
+        memo[key] = total
+        return total
+
+    return count(board.occupancy_mask, board.available_mask)
+
 
 class SolverEngine:
-    def __init__(self, board: DominosaBoard):
+    def __init__(self, board: DominosaBoard, time_budget: float = 1.0, store: Optional[TTStore] = None,
+                 table: Optional[GameTable] = None, seed: Optional[int] = None,
+                 memory: Optional[MemoryBudget] = None):
         self.board = board
-        self.dp_memo: Dict[Tuple[int, FrozenSet[Tuple[int, int]]], bool] = {}
-        self.nodes_visited = 0
+        self.table = table or GameTable()
+        self.dp_memo = self.table.dp_memo
+        self.proven_moves = self.table.proven_moves
+        self.store = store
+        self.store_loaded = False
+        self.dc_memo = self.table.dc_memo
+        self.dc_adjacency: Dict[int, List[Tuple[int, int, int]]] = {}
+        self.probe_cell_edges: List[List[int]] = []
+        self.probe_pair_edges: List[List[int]] = []
+        self.probe_base = 0
+        self.probe_dead = 0
+        self.probe_results: Dict[int, Tuple[int, int, int, int]] = {}
+        self.stats = SolveStats()
+        self.stats_sinks: List[StatsSink] = []
         self.is_cancelled = False 
 
+        self.time_budget = time_budget
+        self.search_deadline = 0.0
+        self.game_tt = self.table.game_tt
+        self.game_edges: List[Tuple[int, int, int]] = []
+        self.pair_count = len(board.pair_index)
+        self.ordering = MoveOrdering(seed)
+        self.memory = memory or MemoryBudget.from_env()
+        self.memory.size_keys(board.rows * board.cols + len(board.pair_index))
+        self.memory_exhausted = False
+
+    @property
+    def nodes_visited(self) -> int:
+        return self.stats.nodes_expanded
+
+    def add_stats_sink(self, sink: StatsSink):
+        self.stats_sinks.append(sink)
+
+    def count_solutions(self, limit: int = 2) -> int:
+        return count_solutions(self.board, limit)
+
+    def _load_store(self):
+        if self.store is None or self.store_loaded: return
+        self.store_loaded = True
+        for (kind, key), value in self.store.table(board_fingerprint(self.board.matrix_key)).items():
+            if kind == KIND_VERDICT:
+                self.dp_memo.setdefault(key, bool(value))
+            elif kind == KIND_BEST_MOVE:
+                self.proven_moves.setdefault(key, value)
+
+    def _save_store(self):
+        # A cancelled search leaves unproven False verdicts behind; never persist those.
+        if self.store is None or self._stopped(): return
+        fingerprint = board_fingerprint(self.board.matrix_key)
+        verdicts, moves = self.table.take_unsaved()
+        self.store.put_many(fingerprint, KIND_VERDICT, {k: int(v) for k, v in verdicts.items()})
+        self.store.put_many(fingerprint, KIND_BEST_MOVE, moves)
+        self.store.flush()
+
+    def _stopped(self) -> bool:
+        return self.is_cancelled or self.memory_exhausted
+
+    def _memo_entries(self) -> int:
+        return self.table.entries() + len(self.probe_results)
+
+    def _check_memory(self, depth: int):
+        # Near the limit the oldest memo entries are evicted; if that does not
+        # get usage back under it, the search gives up and reports unknown.
+        used = self.memory.usage(self._memo_entries(), depth)
+        if not self.memory.near_limit(used):
+            return
+        with self.stats.phase("evict"):
+            while self.memory.near_limit(used):
+                dropped = self.table.evict(EVICT_FRACTION) + len(self.probe_results)
+                self.probe_results.clear()
+                if not dropped:
+                    break
+                self.stats.memory_evicted += dropped
+                used = self.memory.usage(self._memo_entries(), depth)
+        if self.memory.over_limit(used):
+            self.memory_exhausted = True
+
     def _apply_move(self, move: EdgeBond):
+        self.stats.nodes_expanded += 1
         move.node_a.occupied = True
         move.node_b.occupied = True
         move.state = BondState.CONFIRMED
         self.board.available_dominoes.remove(move.get_pair_id())
+        self.board.occupancy_mask |= self.board.edge_cell_bits[move.index]
+        self.board.available_mask &= ~self.board.edge_pair_bits[move.index]
 
     def _undo_move(self, move: EdgeBond):
         move.node_a.occupied = False
         move.node_b.occupied = False
         move.state = BondState.UNDECIDED
         self.board.available_dominoes.add(move.get_pair_id())
+        self.board.occupancy_mask &= ~self.board.edge_cell_bits[move.index]
+        self.board.available_mask |= self.board.edge_pair_bits[move.index]
 
     def _forward_check(self) -> bool:
+        self.stats.forward_checks += 1
         for pair in self.board.available_dominoes:
             has_candidate = any(
                 e for e in self.board.edges
@@ -31,16 +173,12 @@ class SolverEngine:
                 and e.get_pair_id() == pair
             )
             if not has_candidate:
+                self.stats.forward_check_failures += 1
                 return False
         return True
 
-    def _get_state_key(self) -> Tuple[int, FrozenSet[Tuple[int, int]]]:
-        occupancy = 0
-        for r in range(self.board.rows):
-            for c in range(self.board.cols):
-                if self.board.cells[r][c].occupied:
-                    occupancy |= (1 << (r * self.board.cols + c))
-        return (occupancy, frozenset(self.board.available_dominoes))
+    def _get_state_key(self) -> int:
+        return (self.board.occupancy_mask << len(self.board.pair_index)) | self.board.available_mask
 
     def _get_all_valid_moves(self) -> List[EdgeBond]:
         return [e for e in self.board.edges
@@ -49,14 +187,6 @@ class SolverEngine:
                 and not e.node_b.occupied
                 and e.get_pair_id() in self.board.available_dominoes]
 
-    def _score_move(self, edge: EdgeBond) -> int:
-        score = 0
-        n1_deg = sum(1 for e in edge.node_a.edges if e.state == BondState.UNDECIDED)
-        n2_deg = sum(1 for e in edge.node_b.edges if e.state == BondState.UNDECIDED)
-        if n1_deg == 1 or n2_deg == 1:
-            score += 10
-        return score
-
     def _pick_most_constrained_pair(self) -> Optional[Tuple[int, int]]:
         if not self.board.available_dominoes:
             return None
@@ -79,13 +209,17 @@ class SolverEngine:
         return best_pair
 
     def _validate_with_dp(self) -> bool:
+        start = time.perf_counter()
         W, H = self.board.cols, self.board.rows
         grid = [[False for _ in range(W)] for _ in range(H)]
         for r in range(H):
             for c in range(W):
                 if self.board.cells[r][c].occupied:
                     grid[r][c] = True
-        return self._can_tile_bottom_up(grid, W, H)
+        result = self._can_tile_bottom_up(grid, W, H)
+        self.stats.tiling_calls += 1
+        self.stats.tiling_time += time.perf_counter() - start
+        return result
 
     def _can_tile_bottom_up(self, grid: List[List[bool]], W: int, H: int) -> bool:
         dp = {0: True}
@@ -112,6 +246,91 @@ class SolverEngine:
                 return False
         return 0 in dp
 
+    def _tiling_step(self, masks: Set[int], i: int, occ: int) -> Set[int]:
+        W, N = self.board.cols, self.board.rows * self.board.cols
+        filled = (occ >> i) & 1
+        nxt = set()
+        for mask in masks:
+            if mask & 1:
+                if not filled:
+                    nxt.add(mask >> 1)
+            elif filled:
+                nxt.add(mask >> 1)
+            else:
+                if i % W + 1 < W and not (occ >> (i + 1)) & 1 and not mask & 2:
+                    nxt.add((mask >> 1) | 1)
+                if i + W < N and not (occ >> (i + W)) & 1:
+                    nxt.add((mask >> 1) | (1 << (W - 1)))
+        return nxt
+
+    def _tiling_back_step(self, masks: Set[int], i: int, occ: int) -> Set[int]:
+        # Inverse of _tiling_step: the profiles at cell i that can reach one of `masks`.
+        W, N = self.board.cols, self.board.rows * self.board.cols
+        top = 1 << (W - 1)
+        filled = (occ >> i) & 1
+        prev = set()
+        for mask in masks:
+            if not mask & top:
+                prev.add((mask << 1) | (0 if filled else 1))
+            if filled:
+                continue
+            if mask & 1 and not mask & top and i % W + 1 < W and not (occ >> (i + 1)) & 1:
+                prev.add((mask & ~1) << 1)
+            if mask & top and i + W < N and not (occ >> (i + W)) & 1:
+                prev.add((mask & ~top) << 1)
+        return prev
+
+    def _batch_tileable(self, occ: int, moves: List[EdgeBond]) -> List[bool]:
+        # Same profile DP as _can_tile_bottom_up, for every child at once. A child
+        # differs from the parent in two cells and a step looks at most W cells
+        # ahead, so it starts from the parent's forward frontier W cells before
+        # its first cell and must meet the parent's backward set after its last.
+        start = time.perf_counter()
+        W, N = self.board.cols, self.board.rows * self.board.cols
+        spans = []
+        for move in moves:
+            a = move.node_a.r * W + move.node_a.c
+            b = move.node_b.r * W + move.node_b.c
+            spans.append((max(0, min(a, b) - W), max(a, b) + 1))
+
+        forward = [{0}]
+        for i in range(max(s for s, _ in spans)):
+            forward.append(self._tiling_step(forward[-1], i, occ) if forward[-1] else set())
+        lowest = min(e for _, e in spans)
+        backward = {N: {0}}
+        for i in range(N - 1, lowest - 1, -1):
+            backward[i] = self._tiling_back_step(backward[i + 1], i, occ) if backward[i + 1] else set()
+
+        results = []
+        for move, (begin, end) in zip(moves, spans):
+            child = occ | self.board.edge_cell_bits[move.index]
+            masks = forward[begin]
+            for i in range(begin, end):
+                if not masks:
+                    break
+                masks = self._tiling_step(masks, i, child)
+            results.append(not masks.isdisjoint(backward[end]))
+
+        self.stats.tiling_calls += 1
+        self.stats.tiling_time += time.perf_counter() - start
+        return results
+
+    def _children_with_tiling(self, moves: List[EdgeBond]):
+        # The first child usually succeeds, so it is checked on its own; only
+        # once it fails are the remaining siblings filtered in a single batch.
+        if not moves:
+            return
+        yield moves[0], False
+        rest = moves[1:]
+        if len(rest) < BATCH_TILING_MIN:
+            for move in rest:
+                yield move, False
+            return
+        flags = self._batch_tileable(self.board.occupancy_mask, rest)
+        for move, ok in zip(rest, flags):
+            if ok:
+                yield move, True
+
     def _validate_with_backtrack(self) -> bool:
         W, H = self.board.cols, self.board.rows
         grid = [[False for _ in range(W)] for _ in range(H)]
@@ -122,7 +341,7 @@ class SolverEngine:
         return self._solve_backtrack(grid, W, H, 0)
 
     def _solve_backtrack(self, grid: List[List[bool]], W: int, H: int, idx: int) -> bool:
-        self.nodes_visited += 1
+        self.stats.nodes_expanded += 1
         
         while idx < W * H and grid[idx // W][idx % W]:
             idx += 1
@@ -174,138 +393,279 @@ class SolverEngine:
         return moves
 
     def _strat_greedy(self) -> Tuple[Optional[EdgeBond], str]:
-        naked_singles = self._get_naked_singles()
-        self.nodes_visited += len(naked_singles)
+        with self.stats.phase("naked_singles"):
+            naked_singles = self._get_naked_singles()
         if naked_singles:
             return naked_singles[0], "Greedy: Naked Single"
 
-        hidden_singles = self._get_hidden_singles()
-        self.nodes_visited += len(hidden_singles)
+        with self.stats.phase("hidden_singles"):
+            hidden_singles = self._get_hidden_singles()
         if hidden_singles:
             return hidden_singles[0], "Greedy: Hidden Single"
 
         return None, "Greedy Exhausted"
 
-    def _solve_region(self, region: List[CellNode]) -> List[EdgeBond]:
-        if self.is_cancelled: return []
-        if len(region) <= 4:
-            return self._trivial_solution(region)
-            
-        left_region, right_region = self._split_region(region)
-        left_solution = self._solve_region(left_region)
-        right_solution = self._solve_region(right_region)
-        
-        return self._combine_regions(left_solution, right_solution)
+    def _placed_edge_mask(self) -> int:
+        mask = 0
+        for e in self.board.edges:
+            if e.state == BondState.CONFIRMED:
+                mask |= 1 << e.index
+        return mask
 
-    def _split_region(self, region: List[CellNode]) -> Tuple[List[CellNode], List[CellNode]]:
-        if not region: return [], []
-        
-        min_r, max_r = min(c.r for c in region), max(c.r for c in region)
-        min_c, max_c = min(c.c for c in region), max(c.c for c in region)
-        
-        left, right = [], []
-        if (max_c - min_c) >= (max_r - min_r):
-            mid_c = (min_c + max_c) // 2
-            for c in region:
-                if c.c <= mid_c: left.append(c)
-                else: right.append(c)
+    def _sync_probe_cache(self, placed: int):
+        if not self.probe_cell_edges:
+            W = self.board.cols
+            self.probe_cell_edges = [[] for _ in range(self.board.rows * W)]
+            self.probe_pair_edges = [[] for _ in range(len(self.board.pair_index))]
+            for e in self.board.edges:
+                self.probe_cell_edges[e.node_a.r * W + e.node_a.c].append(e.index)
+                self.probe_cell_edges[e.node_b.r * W + e.node_b.c].append(e.index)
+                self.probe_pair_edges[self.board.pair_index[e.get_pair_id()]].append(e.index)
+
+        # Probing is monotone: a probe that failed keeps failing once more
+        # dominoes are placed, so only a removal forces a full reset.
+        if self.probe_base & ~placed:
+            self.probe_dead = 0
+            self.probe_results.clear()
+        self.probe_base = placed
+
+    def _propagate(self, occ: int, avail: int, placed: int, dead: int) -> Optional[Tuple[int, int, int]]:
+        cell_bits, pair_bits = self.board.edge_cell_bits, self.board.edge_pair_bits
+        full = (1 << (self.board.rows * self.board.cols)) - 1
+
+        def live(edges: List[int]) -> List[int]:
+            return [i for i in edges
+                    if not (dead >> i) & 1 and not occ & cell_bits[i] and avail & pair_bits[i]]
+
+        changed = True
+        while changed:
+            changed = False
+            for groups, free in ((self.probe_cell_edges, ~occ & full), (self.probe_pair_edges, avail)):
+                while free:
+                    low = free & -free
+                    free ^= low
+                    idx = low.bit_length() - 1
+                    if groups is self.probe_cell_edges and occ & low: continue
+                    if groups is self.probe_pair_edges and not avail & low: continue
+                    options = live(groups[idx])
+                    if not options:
+                        return None
+                    if len(options) == 1:
+                        i = options[0]
+                        occ |= cell_bits[i]
+                        avail &= ~pair_bits[i]
+                        placed |= 1 << i
+                        changed = True
+        return occ, avail, placed
+
+    def _probe_is_current(self, entry: Tuple[int, int, int, int], placed: int, dead: int) -> bool:
+        occ, avail, result_placed, result_dead = entry
+        if placed & ~result_placed:
+            return False
+        # Edges condemned since the probe only matter if they were still open in it.
+        fresh = dead & ~result_dead
+        while fresh:
+            low = fresh & -fresh
+            fresh ^= low
+            i = low.bit_length() - 1
+            if not occ & self.board.edge_cell_bits[i] and avail & self.board.edge_pair_bits[i]:
+                return False
+        return True
+
+    def _probe(self, edge_idx: int, occ: int, avail: int, placed: int) -> Optional[Tuple[int, int, int, int]]:
+        entry = self.probe_results.get(edge_idx)
+        if entry is not None and self._probe_is_current(entry, placed, self.probe_dead):
+            self.stats.memo_hits += 1
+            return entry
+        self.stats.memo_misses += 1
+        self.stats.nodes_expanded += 1
+
+        result = self._propagate(occ | self.board.edge_cell_bits[edge_idx],
+                                 avail & ~self.board.edge_pair_bits[edge_idx],
+                                 placed | (1 << edge_idx), self.probe_dead)
+        if result is None:
+            self.probe_dead |= 1 << edge_idx
+            self.probe_results.pop(edge_idx, None)
+            return None
+        self.probe_results[edge_idx] = result + (self.probe_dead,)
+        return self.probe_results[edge_idx]
+
+    def _strat_probing(self) -> Tuple[Optional[EdgeBond], str]:
+        occ, avail = self.board.occupancy_mask, self.board.available_mask
+        placed = self._placed_edge_mask()
+        self._sync_probe_cache(placed)
+
+        reason = "Probing: Forced Single"
+        while True:
+            with self.stats.phase("propagate"):
+                root = self._propagate(occ, avail, placed, self.probe_dead)
+            if root is None:
+                return None, "Probing: Contradiction"
+            forced = root[2] & ~placed
+            if forced:
+                return self.board.edges[(forced & -forced).bit_length() - 1], reason
+
+            with self.stats.phase("probe"):
+                candidates = [e.index for e in self._get_all_valid_moves()
+                              if not (self.probe_dead >> e.index) & 1]
+                outcomes = {i: self._probe(i, occ, avail, placed) for i in candidates}
+            if any(result is None for result in outcomes.values()):
+                reason = "Probing: Failed Literal"
+                continue
+            break
+
+        # A placement implied by every option of some cell holds in every solution.
+        W = self.board.cols
+        free = ~occ & ((1 << (self.board.rows * W)) - 1)
+        while free:
+            low = free & -free
+            free ^= low
+            common = -1
+            for i in self.probe_cell_edges[low.bit_length() - 1]:
+                if i in outcomes:
+                    common &= outcomes[i][2]
+            common &= ~placed
+            if common > 0:
+                return self.board.edges[(common & -common).bit_length() - 1], "Probing: Common Implication"
+
+        return None, "Probing Exhausted"
+
+    def _build_adjacency(self) -> Dict[int, List[Tuple[int, int, int]]]:
+        W = self.board.cols
+        adjacency: Dict[int, List[Tuple[int, int, int]]] = {}
+        for e in self.board.edges:
+            a, b = e.node_a.r * W + e.node_a.c, e.node_b.r * W + e.node_b.c
+            pair_bit = self.board.edge_pair_bits[e.index]
+            adjacency.setdefault(a, []).append((1 << b, pair_bit, e.index))
+            adjacency.setdefault(b, []).append((1 << a, pair_bit, e.index))
+        return adjacency
+
+    def _enumerate_region(self, region: int, avail: int) -> Dict[int, int]:
+        tilings: Dict[int, int] = {}
+        adjacency = self.dc_adjacency
+
+        def place(rem: int, used: int, witness: int):
+            if not rem:
+                tilings.setdefault(used, witness)
+                return
+            self.stats.nodes_expanded += 1
+            low = rem & -rem
+            for other_bit, pair_bit, e_idx in adjacency.get(low.bit_length() - 1, ()):
+                if rem & other_bit and avail & pair_bit and not used & pair_bit:
+                    place(rem & ~low & ~other_bit, used | pair_bit, witness if witness >= 0 else e_idx)
+
+        place(region, 0, -1)
+        return tilings
+
+    def _split_region(self, region: int) -> Tuple[int, int, List[Tuple[int, int, int]]]:
+        W = self.board.cols
+        cells = [i for i in range(self.board.rows * W) if region >> i & 1]
+        rows = [i // W for i in cells]
+        cols = [i % W for i in cells]
+
+        if max(cols) - min(cols) >= max(rows) - min(rows):
+            mid = (min(cols) + max(cols)) // 2
+            left = sum(1 << i for i in cells if i % W <= mid)
         else:
-            mid_r = (min_r + max_r) // 2
-            for c in region:
-                if c.r <= mid_r: left.append(c)
-                else: right.append(c)
-                
-        if not left or not right:
-            mid = len(region) // 2
-            return region[:mid], region[mid:]
-            
-        return left, right
+            mid = (min(rows) + max(rows)) // 2
+            left = sum(1 << i for i in cells if i // W <= mid)
+        right = region & ~left
 
-    def _trivial_solution(self, region: List[CellNode]) -> List[EdgeBond]:
-        solution = []
-        free_cells = set(region)
-        
-        for u in list(free_cells):
-            if u not in free_cells: continue
-            for e in u.edges:
-                v = e.node_a if e.node_b == u else e.node_b
-                if (v in free_cells and e.state != BondState.BLOCKED and 
-                    e.get_pair_id() in self.board.available_dominoes):
-                    solution.append(e)
-                    free_cells.remove(u)
-                    free_cells.remove(v)
-                    break
-        return solution
+        cut = []
+        for i in cells:
+            if left >> i & 1:
+                for other_bit, pair_bit, e_idx in self.dc_adjacency.get(i, ()):
+                    if right & other_bit:
+                        cut.append(((1 << i) | other_bit, pair_bit, e_idx))
+        return left, right, cut
 
-    def _combine_regions(self, left: List[EdgeBond], right: List[EdgeBond]) -> List[EdgeBond]:
-        left_nodes = {n for e in left for n in (e.node_a, e.node_b)}
-        right_nodes = {n for e in right for n in (e.node_a, e.node_b)}
-        
-        boundary = set()
-        for u in left_nodes:
-            for e in u.edges:
-                v = e.node_a if e.node_b == u else e.node_b
-                if v in right_nodes:
-                    boundary.add(u)
-                    boundary.add(v)
-                    
-        merged = left + right
-        broken = []
-        
-        for e in merged[:]:
-            if e.node_a in boundary or e.node_b in boundary:
-                merged.remove(e)
-                broken.append(e)
-                
-        free_cells = {n for e in broken for n in (e.node_a, e.node_b)}
-        
-        cross_edges = []
-        for u in free_cells:
-            for e in u.edges:
-                v = e.node_a if e.node_b == u else e.node_b
-                if v in free_cells and e.get_pair_id() in self.board.available_dominoes:
-                    if (u in left_nodes and v in right_nodes) or (v in left_nodes and u in right_nodes):
-                        if e not in cross_edges: cross_edges.append(e)
-                        
-        for e in cross_edges:
-            if e.node_a in free_cells and e.node_b in free_cells:
-                merged.append(e)
-                free_cells.remove(e.node_a)
-                free_cells.remove(e.node_b)
-                
-        local_edges = []
-        for u in free_cells:
-            for e in u.edges:
-                v = e.node_a if e.node_b == u else e.node_b
-                if v in free_cells and e.get_pair_id() in self.board.available_dominoes:
-                    if e not in local_edges: local_edges.append(e)
-                    
-        for e in local_edges:
-            if e.node_a in free_cells and e.node_b in free_cells:
-                merged.append(e)
-                free_cells.remove(e.node_a)
-                free_cells.remove(e.node_b)
-                
-        if free_cells:
-            rescue = self._trivial_solution(list(free_cells))
-            merged.extend(rescue)
-                
-        return merged
+    def _boundary_profiles(self, cut: List[Tuple[int, int, int]], avail: int, parity: int):
+        # A profile is the set of dominoes laid across the separator: the cut
+        # cells they cover, the pairs they consume and one of their edges.
+        def extend(k: int, cells: int, pairs: int, count: int, witness: int):
+            if k == len(cut):
+                if count % 2 == parity:
+                    yield cells, pairs, witness
+                return
+            yield from extend(k + 1, cells, pairs, count, witness)
+            cell_bits, pair_bit, e_idx = cut[k]
+            if avail & pair_bit and not pairs & pair_bit and not cells & cell_bits:
+                yield from extend(k + 1, cells | cell_bits, pairs | pair_bit, count + 1, e_idx)
+
+        yield from extend(0, 0, 0, 0, -1)
+
+    def _region_tilings(self, region: int, avail: int, target: int = -1) -> Dict[int, int]:
+        # Maps every set of pairs that can exactly tile `region` to one edge of
+        # such a tiling. With a target only that pair set is looked for.
+        if self._stopped():
+            return {}
+        if region == 0:
+            return {0: -1}
+        size = bin(region).count("1")
+        if size % 2:
+            return {}
+
+        key = (region, avail)
+        hit = self.dc_memo.get(key) if target < 0 else None
+        if hit is not None:
+            self.stats.memo_hits += 1
+            return hit
+        self.stats.memo_misses += 1
+        if self.stats.memo_misses & CHECK_MASK == 0:
+            self._check_memory(0)
+
+        if size <= DC_BASE_CELLS:
+            tilings = self._enumerate_region(region, avail)
+            self.dc_memo[key] = tilings
+            if target >= 0:
+                return {target: tilings[target]} if target in tilings else {}
+            return tilings
+
+        left, right, cut = self._split_region(region)
+        parity = bin(left).count("1") % 2
+        tilings: Dict[int, int] = {}
+        for cut_cells, cut_pairs, cut_witness in self._boundary_profiles(cut, avail, parity):
+            left_sets = self._region_tilings(left & ~cut_cells, avail & ~cut_pairs)
+            if not left_sets:
+                continue
+            right_sets = self._region_tilings(right & ~cut_cells, avail & ~cut_pairs)
+            if not right_sets:
+                continue
+
+            for l_pairs, l_witness in left_sets.items():
+                witness = cut_witness if cut_witness >= 0 else l_witness
+                if target >= 0:
+                    need = target & ~cut_pairs & ~l_pairs
+                    if (l_pairs | cut_pairs) & ~target or need not in right_sets:
+                        continue
+                    witness = witness if witness >= 0 else right_sets[need]
+                    return {target: witness}
+                for r_pairs, r_witness in right_sets.items():
+                    if r_pairs & l_pairs:
+                        continue
+                    tilings.setdefault(l_pairs | r_pairs | cut_pairs, witness if witness >= 0 else r_witness)
+
+        if target >= 0:
+            return {}
+        if not self._stopped():
+            self.dc_memo[key] = tilings
+        return tilings
 
     def _strat_divide_conquer(self) -> Tuple[Optional[EdgeBond], str]:
-        empty_cells = [c for row in self.board.cells for c in row if not c.occupied]
-        if not empty_cells:
+        free = ~self.board.occupancy_mask & ((1 << (self.board.rows * self.board.cols)) - 1)
+        if not free:
             return None, "D&C Exhausted"
-            
-        self.nodes_visited += len(empty_cells)
-        solution = self._solve_region(empty_cells)
-        
-        for edge in solution:
-            if (edge.state == BondState.UNDECIDED and not edge.node_a.occupied and 
-                not edge.node_b.occupied and edge.get_pair_id() in self.board.available_dominoes):
-                return edge, "Divide & Conquer (Classical)"
-                
-        return None, "D&C Exhausted"
+
+        if len(self.dc_memo) > DC_MEMO_LIMIT:
+            self.dc_memo.clear()
+        self.dc_adjacency = self._build_adjacency()
+        with self.stats.phase("solve_regions"):
+            avail = self.board.available_mask
+            solution = self._region_tilings(free, avail, target=avail)
+
+        if avail not in solution or solution[avail] < 0:
+            return None, "D&C Exhausted"
+        return self.board.edges[solution[avail]], "Divide & Conquer (Separator)"
 
     def _strat_backtracking(self) -> Tuple[Optional[EdgeBond], str]:
         if self.is_cancelled:
@@ -322,7 +682,6 @@ class SolverEngine:
                       and e.get_pair_id() == pair]
                       
         for edge in candidates:
-            self.nodes_visited += 1
             self._apply_move(edge)
             
             if self._forward_check() and self._validate_with_backtrack():
@@ -333,15 +692,21 @@ class SolverEngine:
             
         return None, "Backtracking Exhausted"
 
-    def _is_solvable_dp(self) -> bool:
-        if self.is_cancelled:
+    def _is_solvable_dp(self, depth: int = 1, tiled: bool = False) -> bool:
+        if self._stopped():
             return False
 
+        self.stats.reach_depth(depth)
         key = self._get_state_key()
-        if key in self.dp_memo:
-            return self.dp_memo[key]
+        hit = self.dp_memo.get(key)
+        if hit is not None:
+            self.stats.memo_hits += 1
+            return hit
+        self.stats.memo_misses += 1
+        if self.stats.memo_misses & CHECK_MASK == 0:
+            self._check_memory(depth)
             
-        if not self._validate_with_dp():
+        if not tiled and not self._validate_with_dp():
             self.dp_memo[key] = False
             return False
             
@@ -354,54 +719,391 @@ class SolverEngine:
             self.dp_memo[key] = False
             return False
             
-        candidates.sort(key=lambda e: self._score_move(e), reverse=True)
-        
-        for move in candidates:
-            self.nodes_visited += 1
+        weight = len(self.board.available_dominoes) ** 2
+        free_cells = 2 * len(self.board.available_dominoes)
+        branch = self.ordering.branch_moves(candidates, free_cells, depth)
+        for move, tiled in self._children_with_tiling(branch):
             self._apply_move(move)
             
             if self._forward_check():
-                if self._is_solvable_dp():
+                if self._is_solvable_dp(depth + 1, tiled):
                     self._undo_move(move)
+                    self.ordering.record_success(move, depth, weight)
+                    self.proven_moves[key] = move.index
                     self.dp_memo[key] = True
                     return True
                     
             self._undo_move(move)
             
-        self.dp_memo[key] = False
+        # A cancelled search proves nothing, and the table may be shared.
+        if not self._stopped():
+            self.dp_memo[key] = False
         return False
 
     def _strat_dynamic_programming(self) -> Tuple[Optional[EdgeBond], str]:
+        key = self._get_state_key()
+        if key in self.proven_moves:
+            self.stats.memo_hits += 1
+            return self.board.edges[self.proven_moves[key]], "Dynamic Programming (Proven)"
+        on_line = self.table.next_on_line(self.board.placements)
+        if on_line is not None:
+            self.stats.memo_hits += 1
+            return self.board.edges[on_line], "Dynamic Programming (Proof Reuse)"
+        if self.dp_memo.get(key) is False:
+            self.stats.memo_hits += 1
+            return None, "DP Exhausted"
+
         candidates = self._get_all_valid_moves()
-        candidates.sort(key=lambda e: self._score_move(e), reverse=True)
+        weight = len(self.board.available_dominoes) ** 2
         
-        for move in candidates:
-            self.nodes_visited += 1
+        for move, tiled in self._children_with_tiling(self.ordering.order(candidates)):
             self._apply_move(move)
             
-            if self._forward_check() and self._is_solvable_dp():
+            if self._forward_check() and self._is_solvable_dp(tiled=tiled):
                 self._undo_move(move)
+                self.ordering.record_success(move, 0, weight)
+                self.proven_moves[key] = move.index
+                self.dp_memo[key] = True
+                with self.stats.phase("proof_line"):
+                    self._record_proven_line(move)
                 return move, "Dynamic Programming"
                 
             self._undo_move(move)
             
+        if not self._stopped():
+            self.dp_memo[key] = False
         return None, "DP Exhausted"
 
-    def solve_next_step(self, strategy="DYNAMIC_PROGRAMMING") -> Tuple[Optional[EdgeBond], str]:
-        self.nodes_visited = 0
+    def _record_proven_line(self, move: EdgeBond):
+        # Follow the proof to a full tiling; any later position that only adds
+        # dominoes of this tiling is then answered without a search.
+        applied = [move]
+        self._apply_move(move)
+        try:
+            while self.board.available_dominoes:
+                nxt = self._next_proven_move()
+                if nxt is None:
+                    return
+                applied.append(nxt)
+            self.table.set_line(list(self.board.placements) + [m.index for m in applied])
+        finally:
+            for m in reversed(applied):
+                self._undo_move(m)
+
+    def _check_clock(self, ply: int):
+        self._check_memory(ply)
+        if self._stopped() or time.perf_counter() > self.search_deadline:
+            raise _SearchTimeout()
+
+    def _game_moves(self, occ: int, avail: int, parent: Optional[List[int]] = None) -> List[int]:
+        # A child's moves are a subset of its parent's, so filter those when known.
+        if parent is None:
+            return [i for i, cells, pair in self.game_edges if not occ & cells and avail & pair]
+        cell_bits, pair_bits = self.board.edge_cell_bits, self.board.edge_pair_bits
+        return [i for i in parent if not occ & cell_bits[i] and avail & pair_bits[i]]
+
+    def _evaluate_position(self, occ: int, avail: int, moves: List[int]) -> int:
+        # Greedily packs disjoint moves, filtering `moves` in the same pass; a
+        # leaf never builds its own move list.
+        cell_bits, pair_bits = self.board.edge_cell_bits, self.board.edge_pair_bits
+        remaining = 0
+        for i in moves:
+            if occ & cell_bits[i] or not avail & pair_bits[i]:
+                continue
+            occ |= cell_bits[i]
+            avail &= ~pair_bits[i]
+            remaining += 1
+        if not remaining:
+            return WIN_SCORE if LAST_MOVER_LOSES else -WIN_SCORE
+        # Odd means the side to move would place the last domino.
+        last = 1 if remaining % 2 else -1
+        return -last if LAST_MOVER_LOSES else last
+
+    def _game_order(self, moves: List[int], ply: int, tt_move: int) -> Iterator[int]:
+        # The TT move often cuts off alone; the rest are only sorted if it does not.
+        if tt_move in moves:
+            yield tt_move
+        yield from self.ordering.order_indices([i for i in moves if i != tt_move], ply)
+
+    def _negamax(self, occ: int, avail: int, parent: List[int], depth: int, alpha: int, beta: int,
+                 ply: int) -> int:
+        self.stats.nodes_expanded += 1
+        self.stats.reach_depth(ply)
+        if self.stats.nodes_expanded & 255 == 0:
+            self._check_clock(ply)
+
+        key = (occ << self.pair_count) | avail
+        tt_move = -1
+        entry = self.game_tt.get(key)
+        if entry is None:
+            self.stats.memo_misses += 1
+        else:
+            self.stats.memo_hits += 1
+            e_depth, e_score, e_flag, tt_move = entry
+            if e_depth >= depth or abs(e_score) == WIN_SCORE:
+                if e_flag == TT_EXACT: return e_score
+                if e_flag == TT_LOWER: alpha = max(alpha, e_score)
+                elif e_flag == TT_UPPER: beta = min(beta, e_score)
+                if alpha >= beta: return e_score
+
+        if depth == 0:
+            return self._evaluate_position(occ, avail, parent)
+        moves = self._game_moves(occ, avail, parent)
+        if not moves:
+            # The opponent placed the last domino.
+            return WIN_SCORE if LAST_MOVER_LOSES else -WIN_SCORE
+
+        cell_bits, pair_bits = self.board.edge_cell_bits, self.board.edge_pair_bits
+        alpha_orig = alpha
+        best_score, best_idx = -WIN_SCORE - 1, -1
+        for i in self._game_order(moves, ply, tt_move):
+            score = -self._negamax(occ | cell_bits[i], avail & ~pair_bits[i], moves, depth - 1, -beta, -alpha,
+                                   ply + 1)
+            if score > best_score:
+                best_score, best_idx = score, i
+            alpha = max(alpha, score)
+            if alpha >= beta:
+                self.ordering.record_index(i, ply, depth * depth)
+                break
+
+        if best_score <= alpha_orig: flag = TT_UPPER
+        elif best_score >= beta: flag = TT_LOWER
+        else: flag = TT_EXACT
+        self.game_tt[key] = (depth, best_score, flag, best_idx)
+        return best_score
+
+    def _search_root(self, moves: List[int], depth: int, pv_move: int) -> Tuple[int, int]:
+        occ, avail = self.board.occupancy_mask, self.board.available_mask
+        cell_bits, pair_bits = self.board.edge_cell_bits, self.board.edge_pair_bits
+        alpha, beta = -WIN_SCORE - 1, WIN_SCORE + 1
+        best_score, best_idx = -WIN_SCORE - 1, -1
+        for i in self._game_order(moves, 0, pv_move):
+            score = -self._negamax(occ | cell_bits[i], avail & ~pair_bits[i], moves, depth - 1, -beta, -alpha, 1)
+            if score > best_score:
+                best_score, best_idx = score, i
+            alpha = max(alpha, score)
+        return best_score, best_idx
+
+    def _strat_adversarial(self) -> Tuple[Optional[EdgeBond], str]:
+        # The game search runs on occupancy/pair masks alone and never touches
+        # the board objects, like the profile DPs.
+        self.game_edges = list(zip(range(len(self.board.edges)), self.board.edge_cell_bits,
+                                   self.board.edge_pair_bits))
+        moves = self._game_moves(self.board.occupancy_mask, self.board.available_mask)
+        if not moves:
+            return None, "Adversarial Exhausted"
+
+        self.search_deadline = time.perf_counter() + self.time_budget
+        max_depth = min(len(self.board.available_dominoes),
+                        sum(1 for row in self.board.cells for c in row if not c.occupied) // 2)
+        best_idx, best_score, reached = moves[0], 0, 0
+        try:
+            for depth in range(1, max_depth + 1):
+                with self.stats.phase(f"depth_{depth}"):
+                    score, idx = self._search_root(moves, depth, best_idx)
+                best_idx, best_score, reached = idx, score, depth
+                if abs(score) == WIN_SCORE:
+                    break
+        except _SearchTimeout:
+            pass
+
+        best_move = self.board.edges[best_idx]
+        if best_score == WIN_SCORE:
+            return best_move, f"Adversarial: Forced Win (depth {reached})"
+        if best_score == -WIN_SCORE:
+            return best_move, f"Adversarial: Lost Position (depth {reached})"
+        return best_move, f"Adversarial Alpha-Beta (depth {reached})"
+
+    def _strat_portfolio(self) -> Tuple[Optional[EdgeBond], str]:
+        # Imported here: the portfolio's worker processes import this module.
+        from portfolio import shared_portfolio
+
+        with self.stats.phase("race"):
+            idx, reason, _ = shared_portfolio().race(self.board.snapshot(),
+                                                     should_stop=lambda: self.is_cancelled)
+        if idx is None:
+            return None, reason
+        move = self.board.edges[idx]
+        if move not in self._get_all_valid_moves():
+            return None, f"Portfolio: illegal answer ({reason})"
+        return move, reason
+
+    def _strat_sat(self) -> Tuple[Optional[EdgeBond], str]:
+        on_line = self.table.next_on_line(self.board.placements)
+        if on_line is not None:
+            self.stats.memo_hits += 1
+            return self.board.edges[on_line], "SAT (Proof Reuse)"
+
+        with self.stats.phase("cdcl"):
+            verdict, edges, solver = solve_board(self.board, lambda: self.is_cancelled)
+        self.stats.nodes_expanded += solver.decisions
+        self.stats.conflicts += solver.conflicts
+        if verdict is None:
+            return None, "SAT: Unknown"
+        if not verdict:
+            return None, "SAT: Unsatisfiable"
+        if not edges:
+            return None, "SAT Exhausted"
+        # The model is a full tiling, so it doubles as a proven line for DP.
+        self.table.set_line(list(self.board.placements) + edges)
+        return self.board.edges[edges[0]], "SAT (CDCL)"
+
+    @profiled("solve_next_step", detail=lambda self, strategy="DYNAMIC_PROGRAMMING", *a, **k: strategy)
+    def _restore(self, snapshot: BoardSnapshot):
+        # Placements disappearing means a new game or a takeback on this board;
+        # killer and history scores learnt on the old line are dropped.
+        if not self.board.placements.items() <= set(snapshot.placements):
+            self.ordering.reset()
+        self.board.restore(snapshot)
+
+    def solve_next_step(self, strategy="DYNAMIC_PROGRAMMING",
+                        snapshot: Optional[BoardSnapshot] = None) -> Tuple[Optional[EdgeBond], str]:
+        self.stats = SolveStats(strategy=strategy)
         self.is_cancelled = False 
-        
+        self.memory_exhausted = False
+        start = time.perf_counter()
+        if snapshot is not None:
+            with self.stats.phase("restore"):
+                self._restore(snapshot)
+
+        with self.stats.phase("store"):
+            self._load_store()
+        self.memory.begin(self._memo_entries())
+        with self.stats.phase("strategy"):
+            move, reason = self._run_strategy(strategy)
+        if move is None and self.memory_exhausted and not self.is_cancelled:
+            with self.stats.phase("memory_fallback"):
+                move, reason = self._memory_fallback()
+        if self.store is not None:
+            with self.stats.phase("store"):
+                self._save_store()
+
+        self.stats.reason = reason
+        self.stats.memo_size = (len(self.dp_memo) + len(self.game_tt) + len(self.dc_memo)
+                                 + len(self.probe_results))
+        self.stats.memory_peak = self.memory.finish(self._memo_entries())
+        self.stats.wall_time = time.perf_counter() - start
+        for sink in self.stats_sinks:
+            sink(self.stats)
+        return move, reason
+
+    def _memory_fallback(self) -> Tuple[Optional[EdgeBond], str]:
+        # Probing keeps no table beyond one entry per edge, and the moves it
+        # finds are forced, so they stay sound; past that the answer is unknown.
+        move, reason = self._strat_probing()
+        if move is None:
+            return None, "Memory Budget Exceeded"
+        return move, f"Memory Budget: {reason}"
+
+    def _run_strategy(self, strategy: str) -> Tuple[Optional[EdgeBond], str]:
         if strategy == "GREEDY":
             return self._strat_greedy()
+        elif strategy == "PROBING":
+            return self._strat_probing()
         elif strategy == "DIVIDE_CONQUER":
             return self._strat_divide_conquer()
         elif strategy == "DYNAMIC_PROGRAMMING":
             return self._strat_dynamic_programming()
         elif strategy == "BACKTRACKING":
             return self._strat_backtracking()
+        elif strategy == "ADVERSARIAL":
+            return self._strat_adversarial()
+        elif strategy == "PORTFOLIO":
+            return self._strat_portfolio()
+        elif strategy == "SAT":
+            return self._strat_sat()
             
         return None, f"{strategy} Exhausted"
 
-    def get_hint_move(self, strategy="DYNAMIC_PROGRAMMING") -> Optional[EdgeBond]:
-        move, _ = self.solve_next_step(strategy)
+    def get_hint_move(self, strategy="DYNAMIC_PROGRAMMING",
+                      snapshot: Optional[BoardSnapshot] = None) -> Optional[EdgeBond]:
+        move, _ = self.solve_next_step(strategy, snapshot)
         return move
+
+    def _next_forced_move(self) -> Tuple[Optional[EdgeBond], str]:
+        naked_singles = self._get_naked_singles()
+        if naked_singles:
+            return naked_singles[0], "Forced: Naked Single"
+        hidden_singles = self._get_hidden_singles()
+        if hidden_singles:
+            return hidden_singles[0], "Forced: Hidden Single"
+        return None, ""
+
+    def _next_proven_move(self) -> Optional[EdgeBond]:
+        key = self._get_state_key()
+        if key in self.proven_moves:
+            move = self.board.edges[self.proven_moves[key]]
+            self._apply_move(move)
+            return move
+
+        candidates = self._get_all_valid_moves()
+        free_cells = 2 * len(self.board.available_dominoes)
+        for move in self.ordering.branch_moves(candidates, free_cells):
+            self._apply_move(move)
+            if self._forward_check() and self._is_solvable_dp():
+                self.proven_moves[key] = move.index
+                return move
+            self._undo_move(move)
+        return None
+
+    def _stop_reason(self, reason: str) -> str:
+        if self.is_cancelled:
+            return "Cancelled"
+        if self.memory_exhausted:
+            return "Memory Budget Exceeded"
+        return reason
+
+    def iter_solution(self, strategy="DYNAMIC_PROGRAMMING",
+                      snapshot: Optional[BoardSnapshot] = None) -> Iterator[Tuple[EdgeBond, str, SolveStats]]:
+        # DP moves stay applied on the engine's board while iterating, so later
+        # steps reuse the memo built for earlier ones; all are undone at the end.
+        self.stats = SolveStats(strategy=strategy)
+        self.is_cancelled = False
+        self.memory_exhausted = False
+        start = time.perf_counter()
+        if snapshot is not None:
+            self._restore(snapshot)
+        self._load_store()
+        self.memory.begin(self._memo_entries())
+
+        original = self.board.snapshot()
+        applied: List[EdgeBond] = []
+        try:
+            while self.board.available_dominoes and not self.is_cancelled:
+                if strategy != "DYNAMIC_PROGRAMMING":
+                    # Other strategies take every step exactly as solve_next_step
+                    # runs them, on real placements that are rolled back at the end.
+                    with self.stats.phase("strategy"):
+                        move, reason = self._run_strategy(strategy)
+                    if move is None:
+                        self.stats.reason = self._stop_reason(reason)
+                        break
+                    self.board.confirm_edge(move, 1)
+                else:
+                    with self.stats.phase("forced"):
+                        move, reason = self._next_forced_move()
+                    if move is not None:
+                        self._apply_move(move)
+                    else:
+                        with self.stats.phase("search"):
+                            move = self._next_proven_move()
+                        if move is None:
+                            self.stats.reason = self._stop_reason("Unsolvable")
+                            break
+                        reason = "Search: Proven Continuation"
+                    applied.append(move)
+
+                self.stats.wall_time = time.perf_counter() - start
+                self.stats.memo_size = len(self.dp_memo)
+                yield move, reason, self.stats
+            else:
+                self.stats.reason = "Cancelled" if self.is_cancelled else "Solved"
+        finally:
+            for move in reversed(applied):
+                self._undo_move(move)
+            self.board.restore(original)
+            self._save_store()
+            self.stats.memory_peak = self.memory.finish(self._memo_entries())
+            self.stats.wall_time = time.perf_counter() - start
+            for sink in self.stats_sinks:
+                sink(self.stats)
@@ -0,0 +1,70 @@
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Dict, IO, Optional
+
+
+@dataclass
+class SolveStats:
+    strategy: str = ""
+    reason: str = ""
+    nodes_expanded: int = 0
+    forward_checks: int = 0
+    forward_check_failures: int = 0
+    tiling_calls: int = 0
+    tiling_time: float = 0.0
+    memo_hits: int = 0
+    memo_misses: int = 0
+    memo_size: int = 0
+    conflicts: int = 0
+    memory_peak: int = 0
+    memory_evicted: int = 0
+    max_depth: int = 0
+    wall_time: float = 0.0
+    phase_times: Dict[str, float] = field(default_factory=dict)
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phase_times[name] = self.phase_times.get(name, 0.0) + time.perf_counter() - start
+
+    def reach_depth(self, depth: int):
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    def summary(self) -> str:
+        parts = [f"{self.nodes_expanded} nodes", f"{self.wall_time * 1000:.1f} ms"]
+        if self.memo_hits or self.memo_misses:
+            parts.append(f"memo {self.memo_hits}/{self.memo_hits + self.memo_misses} hits")
+        if self.max_depth:
+            parts.append(f"depth {self.max_depth}")
+        if self.conflicts:
+            parts.append(f"{self.conflicts} conflicts")
+        if self.memory_peak:
+            parts.append(f"peak {self.memory_peak / (1 << 20):.1f} MB")
+        if self.memory_evicted:
+            parts.append(f"{self.memory_evicted} evicted")
+        return " · ".join(parts)
+
+
+StatsSink = Callable[[SolveStats], None]
+
+
+class JsonStatsSink:
+    def __init__(self, stream: Optional[IO[str]] = None):
+        self.stream = stream or sys.stderr
+
+    def __call__(self, stats: SolveStats):
+        self.stream.write(stats.to_json() + "\n")
+        self.stream.flush()
@@ -28,6 +28,7 @@ class EdgeBond:
     node_b: CellNode
     state: BondState = BondState.UNDECIDED
     owner_id: int = 0
+    index: int = field(default=-1, compare=False)
 
     def get_pair_id(self) -> Tuple[int, int]:
         return tuple(sorted((self.node_a.value, self.node_b.value)))
@@ -37,3 +38,11 @@ class EdgeBond:
 
     def __repr__(self):
         return f"Edge[{self.node_a}<->{self.node_b}]"
+
+@dataclass(frozen=True)
+class BoardSnapshot:
+    matrix: Tuple[Tuple[int, ...], ...]
+    placements: Tuple[Tuple[int, int], ...] = ()
+
+    def __repr__(self):
+        return f"Snapshot[{len(self.matrix)}x{len(self.matrix[0])}|{len(self.placements)} placed]"
@@ -0,0 +1,50 @@
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import random_tiling
+
+
+def _state(board):
+    return (board.placements, board.occupancy_mask, board.available_mask, board.available_dominoes,
+            board.placed_dominoes, [(e.state, e.owner_id) for e in board.edges],
+            [(c.occupied, c.owner_id) for row in board.cells for c in row])
+
+
+def _play_randomly(board, rng, count):
+    for _ in range(count):
+        moves = [e for e in board.edges if not board.edge_cell_bits[e.index] & board.occupancy_mask
+                 and board.edge_pair_bits[e.index] & board.available_mask]
+        if not moves:
+            return
+        board.confirm_edge(rng.choice(moves), rng.choice((1, 2)))
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_restore_matches_a_fresh_board(seed):
+    rng = random.Random(seed)
+    matrix = random_tiling(4, rng)
+    target, board = DominosaBoard(matrix), DominosaBoard(matrix)
+    _play_randomly(target, rng, rng.randint(0, 6))
+    _play_randomly(board, rng, rng.randint(0, 6))
+    board.restore(target.snapshot())
+    assert _state(board) == _state(DominosaBoard.from_snapshot(target.snapshot()))
+    assert _state(board) == _state(target)
+
+
+def test_fork_is_independent():
+    board = DominosaBoard(random_tiling(3, random.Random(1)))
+    _play_randomly(board, random.Random(2), 2)
+    before = board.snapshot()
+    fork = board.fork()
+    _play_randomly(fork, random.Random(3), 3)
+    assert board.snapshot() == before
+    assert fork.snapshot() != before
+
+
+def test_restore_rejects_another_board():
+    board = DominosaBoard(random_tiling(3, random.Random(1)))
+    other = DominosaBoard(random_tiling(3, random.Random(4)))
+    with pytest.raises(ValueError):
+        board.restore(other.snapshot())
@@ -0,0 +1,37 @@
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import build_valid_matrix
+from solver import SolverEngine, count_solutions
+
+
+def _is_legal(board, move):
+    return (not board.edge_cell_bits[move.index] & board.occupancy_mask
+            and board.edge_pair_bits[move.index] & board.available_mask)
+
+
+@pytest.mark.parametrize("n", [2, 3, 4, 5, 6])
+def test_divide_conquer_moves_are_legal_and_keep_the_board_solvable(n):
+    board = DominosaBoard(build_valid_matrix(n, random.Random(n)))
+    engine = SolverEngine(board.fork())
+    while board.get_progress() < 1.0:
+        move, reason = engine.solve_next_step("DIVIDE_CONQUER", board.snapshot())
+        assert move is not None, reason
+        assert _is_legal(board, move)
+        board.confirm_edge(board.edges[move.index], 1)
+        assert count_solutions(board, 1) == 1
+
+
+def test_divide_conquer_gives_up_on_a_dead_position():
+    rng = random.Random(9)
+    for _ in range(40):
+        board = DominosaBoard(build_valid_matrix(4, rng))
+        moves = [e for e in board.edges if _is_legal(board, e)]
+        board.confirm_edge(rng.choice(moves), 1)
+        if count_solutions(board, 1) == 0:
+            move, _ = SolverEngine(board.fork()).solve_next_step("DIVIDE_CONQUER", board.snapshot())
+            assert move is None
+            return
+    pytest.fail("no dead position sampled")
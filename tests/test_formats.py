@@ -0,0 +1,62 @@
+import io
+import random
+
+import pytest
+
+from formats import format_game_id, format_grid, parse_game_id, read_boards, write_boards
+from generator import random_tiling
+
+SMALL = random_tiling(4, random.Random(1))
+LARGE = random_tiling(12, random.Random(1))
+
+
+@pytest.mark.parametrize("matrix", [SMALL, LARGE])
+def test_game_id_round_trip(matrix):
+    assert parse_game_id(format_game_id(matrix)) == matrix
+
+
+def test_large_values_are_bracketed():
+    game_id = format_game_id(LARGE)
+    assert game_id.startswith("12:")
+    assert "[10]" in game_id and "[12]" in game_id
+    assert "[9]" not in game_id
+
+
+def test_game_id_option_letters_are_ignored():
+    assert parse_game_id("4dt:" + format_game_id(SMALL).split(":")[1]) == SMALL
+
+
+@pytest.mark.parametrize("text", [
+    "x:12",
+    "4:123",
+    format_game_id(SMALL) + "a",
+    "4:" + "0" * 30,
+])
+def test_bad_game_ids_raise(text):
+    with pytest.raises(ValueError):
+        parse_game_id(text)
+
+
+def test_read_boards_mixes_ids_and_grids():
+    unspaced = "".join("".join(map(str, row)) + "\n" for row in SMALL)
+    text = ("# corpus\n" + format_game_id(SMALL) + "\n\n" + format_grid(SMALL) + "\n"
+            + format_grid(LARGE) + "\n\n" + unspaced)
+    boards = list(read_boards(io.StringIO(text)))
+    assert [m for _, m in boards] == [SMALL, SMALL, LARGE, SMALL]
+    assert [line for line, _ in boards] == [2, 4, 9, 23]
+
+
+@pytest.mark.parametrize("fmt", ["id", "grid"])
+def test_write_then_read_round_trip(fmt):
+    boards = [(1, SMALL), (2, LARGE)]
+    out = io.StringIO()
+    assert write_boards(out, boards, fmt) == 2
+    assert [m for _, m in read_boards(io.StringIO(out.getvalue()))] == [SMALL, LARGE]
+
+
+def test_truncated_grid_reports_its_line():
+    rows = format_grid(SMALL).splitlines()
+    with pytest.raises(ValueError, match="line 1"):
+        list(read_boards(io.StringIO("\n".join(rows[:-1]))))
+    with pytest.raises(ValueError, match="line 5"):
+        list(read_boards(io.StringIO("\n".join(rows[:-1]) + "\n\n" + format_game_id(SMALL))))
@@ -0,0 +1,32 @@
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import build_valid_matrix
+from solver import SolverEngine
+
+MATRIX = build_valid_matrix(5, random.Random(2))
+
+
+@pytest.mark.parametrize("strategy", ["DYNAMIC_PROGRAMMING", "PROBING", "DIVIDE_CONQUER", "SAT"])
+def test_stream_solves_with_the_chosen_strategy(strategy):
+    board = DominosaBoard(MATRIX)
+    engine = SolverEngine(board.fork())
+    before = engine.board.snapshot()
+    reasons = []
+    for move, reason, _ in engine.iter_solution(strategy, board.snapshot()):
+        assert board.confirm_edge(board.edges[move.index], 1)
+        reasons.append(reason)
+    assert engine.stats.reason == "Solved"
+    assert board.get_progress() == 1.0
+    assert engine.board.snapshot() == before
+    if strategy == "SAT":
+        assert all(r.startswith("SAT") for r in reasons)
+
+
+def test_cancelled_stream_says_so():
+    engine = SolverEngine(DominosaBoard(MATRIX))
+    for _ in engine.iter_solution("PROBING"):
+        engine.is_cancelled = True
+    assert engine.stats.reason == "Cancelled"
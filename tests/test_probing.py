@@ -0,0 +1,46 @@
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import build_valid_matrix
+from solver import SolverEngine, count_solutions
+
+
+def _solution(matrix):
+    # The unique tiling, as found by DP.
+    board = DominosaBoard(matrix)
+    engine = SolverEngine(board.fork())
+    while board.get_progress() < 1.0:
+        move, _ = engine.solve_next_step("DYNAMIC_PROGRAMMING", board.snapshot())
+        board.confirm_edge(board.edges[move.index], 1)
+    return set(board.placements)
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 6, 7])
+def test_probing_moves_belong_to_the_unique_solution(n):
+    matrix = build_valid_matrix(n, random.Random(n))
+    solution = _solution(matrix)
+    board = DominosaBoard(matrix)
+    engine = SolverEngine(board.fork())
+    while board.get_progress() < 1.0:
+        move, reason = engine.solve_next_step("PROBING", board.snapshot())
+        if move is None:
+            assert reason == "Probing Exhausted"
+            assert count_solutions(board, 1) == 1
+            break
+        assert move.index in solution, reason
+        board.confirm_edge(board.edges[move.index], 1)
+
+
+def test_probing_moves_are_legal_after_a_misplacement():
+    rng = random.Random(5)
+    for _ in range(40):
+        matrix = build_valid_matrix(4, rng)
+        solution = _solution(matrix)
+        board = DominosaBoard(matrix)
+        board.confirm_edge(rng.choice([e for e in board.edges if e.index not in solution]), 1)
+        move, reason = SolverEngine(board.fork()).solve_next_step("PROBING", board.snapshot())
+        if move is not None:
+            assert not board.edge_cell_bits[move.index] & board.occupancy_mask, reason
+            assert board.edge_pair_bits[move.index] & board.available_mask, reason
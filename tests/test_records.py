@@ -0,0 +1,57 @@
+import io
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import build_valid_matrix
+from records import GameRecorder, parse_record, read_record, replay, summarize
+from tournament import play_game
+
+MATRIX = build_valid_matrix(4, random.Random(6))
+
+
+def _record_bytes(moves, strategies=("GREEDY", "DYNAMIC_PROGRAMMING"), time_budget=0.25):
+    stream = io.BytesIO()
+    recorder = GameRecorder(stream, MATRIX, 42, strategies, time_budget)
+    for edge_idx, owner in moves:
+        recorder.record(edge_idx, owner)
+    return stream.getvalue()
+
+
+def test_header_and_moves_round_trip():
+    moves = [(3, 1), (17, 2), (3, 0), (5, 1)]
+    record = parse_record(_record_bytes(moves))
+    assert record.matrix == MATRIX
+    assert record.seed == 42
+    assert record.strategies == ("GREEDY", "DYNAMIC_PROGRAMMING")
+    assert record.moves == moves
+    assert record.time_budget == 0.25
+
+
+def test_torn_final_move_is_dropped():
+    data = _record_bytes([(3, 1), (17, 2)])
+    assert parse_record(data[:-1]).moves == [(3, 1)]
+    with pytest.raises(ValueError):
+        parse_record(data[:10])
+
+
+def test_recorded_game_replays_the_same_moves(tmp_path):
+    path = str(tmp_path / "game.dsr")
+    strategies = ("DYNAMIC_PROGRAMMING", "PROBING")
+    with GameRecorder.open(path, MATRIX, 6, strategies, 0.5) as recorder:
+        result = play_game(MATRIX, strategies, 6, 0.5, recorder)
+    record = read_record(path)
+    assert len(record.moves) == result.moves
+    assert record.time_budget == 0.5
+    report = summarize(replay(record))
+    assert report["plies"] == result.moves
+    assert report["mismatches"] == 0
+
+
+def test_replay_applies_removals():
+    board = DominosaBoard(MATRIX)
+    edge = next(e for e in board.edges if board.confirm_edge(e, 1))
+    record = parse_record(_record_bytes([(edge.index, 1), (edge.index, 0), (edge.index, 2)],
+                                        strategies=("HUMAN", "HUMAN")))
+    assert replay(record) == []
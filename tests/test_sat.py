@@ -0,0 +1,80 @@
+import io
+import itertools
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import random_tiling
+from sat import CDCLSolver, encode, solve_board
+from solver import count_solutions
+
+
+def _satisfies(assignment, clauses):
+    return all(any(assignment[abs(lit)] == (lit > 0) for lit in clause) for clause in clauses)
+
+
+def _brute_force(num_vars, clauses):
+    for bits in itertools.product((False, True), repeat=num_vars):
+        if _satisfies((None,) + bits, clauses):
+            return True
+    return False
+
+
+def test_cdcl_matches_brute_force_on_random_cnfs():
+    rng = random.Random(5)
+    for _ in range(300):
+        n = rng.randint(3, 10)
+        clauses = [[rng.choice((1, -1)) * rng.randint(1, n) for _ in range(rng.randint(1, 4))]
+                   for _ in range(rng.randint(1, 6 * n))]
+        solver = CDCLSolver(n, clauses)
+        verdict = solver.solve()
+        assert verdict == _brute_force(n, clauses)
+        if verdict:
+            model = set(solver.model())
+            assert _satisfies([None] + [v in model for v in range(1, n + 1)], clauses)
+
+
+@pytest.mark.parametrize("pigeons", [4, 6])
+def test_pigeonhole_is_unsat(pigeons):
+    holes = pigeons - 1
+    var = lambda p, h: p * holes + h + 1
+    clauses = [[var(p, h) for h in range(holes)] for p in range(pigeons)]
+    clauses += [[-var(p, h), -var(q, h)] for h in range(holes)
+                for p in range(pigeons) for q in range(p + 1, pigeons)]
+    assert CDCLSolver(pigeons * holes, clauses).solve() is False
+
+
+def _random_board(n, rng):
+    matrix = random_tiling(n, rng) if rng.random() < 0.5 else None
+    if matrix is None:
+        values = [v for a in range(n + 1) for b in range(a, n + 1) for v in (a, b)]
+        rng.shuffle(values)
+        matrix = [values[r * (n + 2):(r + 1) * (n + 2)] for r in range(n + 1)]
+    board = DominosaBoard(matrix)
+    for _ in range(rng.randint(0, 3)):
+        moves = [e for e in board.edges if not board.edge_cell_bits[e.index] & board.occupancy_mask
+                 and board.edge_pair_bits[e.index] & board.available_mask]
+        if moves:
+            board.confirm_edge(rng.choice(moves), 1)
+    return board
+
+
+def test_board_verdicts_match_count_solutions():
+    rng = random.Random(7)
+    for _ in range(80):
+        board = _random_board(rng.randint(2, 5), rng)
+        verdict, edges, _ = solve_board(board)
+        assert verdict == (count_solutions(board, 1) > 0)
+        if verdict:
+            completed = board.fork()
+            assert all(completed.confirm_edge(completed.edges[i], 1) for i in edges)
+            assert completed.get_progress() == 1.0
+
+
+def test_dimacs_header_counts_vars_and_clauses():
+    cnf = encode(DominosaBoard(random_tiling(3, random.Random(2))))
+    out = io.StringIO()
+    cnf.write_dimacs(out)
+    header = next(line for line in out.getvalue().splitlines() if line.startswith("p "))
+    assert header == f"p cnf {cnf.num_vars} {len(cnf.clauses)}"
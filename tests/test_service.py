@@ -0,0 +1,69 @@
+import asyncio
+import random
+from concurrent.futures import ThreadPoolExecutor
+
+from generator import build_valid_matrix
+from service import SolverService
+
+MATRIX = build_valid_matrix(4, random.Random(3))
+
+
+def _ask(*messages, service=None):
+    service = service or SolverService(executor=ThreadPoolExecutor(2), workers=2)
+
+    async def run():
+        return await asyncio.gather(*(service.handle(m) for m in messages))
+
+    return asyncio.run(run())
+
+
+def test_validate_reports_a_solvable_board():
+    reply, = _ask({"id": 1, "op": "validate", "matrix": MATRIX})
+    assert reply == {"id": 1, "result": {"well_formed": True, "legal": True, "solvable": True, "progress": 0.0}}
+
+
+def test_validate_checks_value_counts():
+    skewed = [row[:] for row in MATRIX]
+    skewed[0][0] = (skewed[0][0] + 1) % 5
+    reply, = _ask({"id": 1, "op": "validate", "matrix": skewed})
+    assert reply["result"]["well_formed"] is False
+    assert reply["result"]["solvable"] is False
+
+
+def test_validate_flags_overlapping_placements():
+    reply, = _ask({"id": 1, "op": "validate", "matrix": MATRIX, "placements": [[0, 1], [1, 1]]})
+    assert reply["result"]["legal"] is False
+
+
+def test_hint_returns_a_legal_move():
+    reply, = _ask({"id": 7, "op": "hint", "matrix": MATRIX, "strategy": "PROBING"})
+    move = reply["result"]["move"]
+    (ra, ca), (rb, cb) = move["a"], move["b"]
+    assert abs(ra - rb) + abs(ca - cb) == 1
+    assert reply["id"] == 7
+
+
+def test_errors_are_replied():
+    replies = _ask({"id": 1, "op": "nope", "matrix": MATRIX},
+                   {"id": 2, "op": "hint", "matrix": MATRIX, "strategy": "NOPE"},
+                   {"id": 3, "op": "hint", "matrix": MATRIX, "placements": [[999, 1]]},
+                   {"id": 4, "op": "hint", "matrix": MATRIX, "placements": [[0, 1], [1, 1]]},
+                   {"id": 5, "op": "hint", "matrix": [[0, 1], [1]]})
+    assert [r["id"] for r in replies] == [1, 2, 3, 4, 5]
+    assert all("error" in r and "result" not in r for r in replies)
+
+
+def test_identical_requests_are_coalesced_then_cached():
+    service = SolverService(executor=ThreadPoolExecutor(2), workers=2)
+    message = {"op": "hint", "matrix": MATRIX}
+    first, second = _ask(dict(message, id=1), dict(message, id=2), service=service)
+    third, = _ask(dict(message, id=3), service=service)
+    assert first["result"] == second["result"] == third["result"]
+    assert service.coalesced == 1 and service.cache_hits == 1
+
+
+def test_budget_bound_answers_are_not_cached():
+    service = SolverService(executor=ThreadPoolExecutor(1), workers=1)
+    service._remember(("validate",), {"solvable": None})
+    service._remember(("hint",), {"move": None, "reason": "Memory Budget Exceeded"})
+    assert not service.cache
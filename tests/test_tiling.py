@@ -0,0 +1,47 @@
+import random
+
+import pytest
+
+from board import DominosaBoard
+from generator import random_tiling
+from solver import SolverEngine
+
+
+def _random_occupancy(board, rng, placements):
+    occ = 0
+    for _ in range(placements):
+        edge = rng.choice(board.edges)
+        if not occ & board.edge_cell_bits[edge.index]:
+            occ |= board.edge_cell_bits[edge.index]
+    return occ
+
+
+def _tileable(engine, board, occ):
+    W, H = board.cols, board.rows
+    grid = [[bool(occ >> (r * W + c) & 1) for c in range(W)] for r in range(H)]
+    return engine._can_tile_bottom_up(grid, W, H)
+
+
+@pytest.mark.parametrize("n", [3, 4, 5, 6])
+def test_batch_tileable_matches_single_checks(n):
+    rng = random.Random(n)
+    board = DominosaBoard(random_tiling(n, rng))
+    engine = SolverEngine(board)
+    for _ in range(60):
+        occ = _random_occupancy(board, rng, rng.randrange(8))
+        children = [e for e in board.edges if not occ & board.edge_cell_bits[e.index]]
+        flags = engine._batch_tileable(occ, children)
+        expected = [_tileable(engine, board, occ | board.edge_cell_bits[e.index]) for e in children]
+        assert flags == expected
+
+
+def test_children_with_tiling_keeps_first_and_filters_rest():
+    rng = random.Random(11)
+    board = DominosaBoard(random_tiling(6, rng))
+    engine = SolverEngine(board)
+    moves = list(board.edges)
+    children = list(engine._children_with_tiling(moves))
+    assert children[0] == (moves[0], False)
+    kept = {move.index for move, _ in children[1:]}
+    occ = board.occupancy_mask
+    assert kept == {m.index for m in moves[1:] if _tileable(engine, board, occ | board.edge_cell_bits[m.index])}
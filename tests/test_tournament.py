@@ -0,0 +1,26 @@
+from tournament import elo_ratings, play_game
+
+# Double-1 on a 2x3 grid: three dominoes, so a full game is at most three moves.
+TINY = [[0, 0, 1], [1, 1, 0]]
+
+
+def test_last_mover_loses():
+    # ADVERSARIAL always moves while a move exists, so the game ends on a stuck board.
+    result = play_game(TINY, ("ADVERSARIAL", "ADVERSARIAL"), time_budget=0.1)
+    last_mover = 1 if result.moves % 2 else 2
+    assert result.winner == 3 - last_mover
+
+
+def test_full_tiling_is_lost_by_the_first_player():
+    # DP only plays moves that keep the board tileable, so all three dominoes go down.
+    result = play_game(TINY, ("DYNAMIC_PROGRAMMING", "DYNAMIC_PROGRAMMING"), time_budget=0.1)
+    assert result.moves == 3
+    assert result.winner == 2
+
+
+def test_elo_moves_towards_the_winner():
+    result = play_game(TINY, ("GREEDY", "ADVERSARIAL"), time_budget=0.1)
+    ratings = elo_ratings([result])
+    winner = result.strategies[result.winner - 1]
+    loser = result.strategies[2 - result.winner]
+    assert ratings[winner] > ratings[loser]
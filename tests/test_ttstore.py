@@ -0,0 +1,85 @@
+import os
+import random
+
+import ttstore
+from board import DominosaBoard
+from gametable import GameTable
+from generator import build_valid_matrix
+from solver import SolverEngine
+from ttstore import KIND_BEST_MOVE, KIND_VERDICT, TTStore
+
+FP = bytes(range(16))
+
+
+def test_put_flush_reload(tmp_path):
+    path = str(tmp_path / "cache.tt")
+    store = TTStore(path)
+    store.put(FP, KIND_VERDICT, 1 << 70, 1)
+    store.put_many(FP, KIND_BEST_MOVE, {5: 7, 6: 8})
+    store.put(FP, KIND_BEST_MOVE, 5, 9)
+    store.close()
+    assert TTStore(path).table(FP) == {(KIND_VERDICT, 1 << 70): 1, (KIND_BEST_MOVE, 5): 9,
+                                       (KIND_BEST_MOVE, 6): 8}
+
+
+def test_truncated_final_record_is_dropped(tmp_path):
+    path = str(tmp_path / "cache.tt")
+    store = TTStore(path)
+    store.put_many(FP, KIND_VERDICT, {1: 1, 2: 0})
+    store.close()
+    with open(path, "r+b") as fh:
+        fh.truncate(os.path.getsize(path) - 1)
+    reloaded = TTStore(path)
+    assert reloaded.table(FP) == {(KIND_VERDICT, 1): 1}
+    assert reloaded.records == 1
+
+
+def test_compaction_keeps_the_latest_values(tmp_path):
+    path = str(tmp_path / "cache.tt")
+    store = TTStore(path)
+    for value in range(3):
+        store.put_many(FP, KIND_VERDICT, {k: value for k in range(100)})
+        store.flush()
+    before = os.path.getsize(path)
+    store.compact()
+    assert os.path.getsize(path) < before
+    reloaded = TTStore(path)
+    assert reloaded.live_records() == reloaded.records == 100
+    assert reloaded.table(FP)[(KIND_VERDICT, 42)] == 2
+
+
+def test_stale_store_is_left_alone(tmp_path):
+    path = str(tmp_path / "old.tt")
+    old = b"DMTT\x01" + ttstore._pack(FP, KIND_VERDICT, 3, 0)
+    with open(path, "wb") as fh:
+        fh.write(old)
+    store = TTStore(path)
+    assert store.table(FP) == {}
+    store.put(FP, KIND_VERDICT, 4, 1)
+    store.close()
+    with open(path, "rb") as fh:
+        assert fh.read() == old
+
+
+def test_store_is_opt_in(monkeypatch, tmp_path):
+    monkeypatch.delenv(ttstore.TT_PATH_ENV, raising=False)
+    assert ttstore.open_default() is None
+    monkeypatch.setenv(ttstore.TT_PATH_ENV, str(tmp_path / "cache.tt"))
+    assert ttstore.open_default().path == str(tmp_path / "cache.tt")
+
+
+def test_engines_only_write_new_entries(tmp_path):
+    path = str(tmp_path / "cache.tt")
+    store = TTStore(path)
+    board = DominosaBoard(build_valid_matrix(5, random.Random(1)))
+    table = GameTable()
+    engine = SolverEngine(board.fork(), store=store, table=table)
+    engine.solve_next_step("DYNAMIC_PROGRAMMING", board.snapshot())
+    written = store.records
+    assert written and table.saved_verdicts == len(table.dp_memo)
+    engine.solve_next_step("DYNAMIC_PROGRAMMING", board.snapshot())
+    assert store.records == written
+    store.close()
+    warm = SolverEngine(board.fork(), store=TTStore(path))
+    move, reason = warm.solve_next_step("DYNAMIC_PROGRAMMING", board.snapshot())
+    assert move is not None and "Proven" in reason
@@ -0,0 +1,184 @@
+import argparse
+import itertools
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from board import DominosaBoard, winner_when_stuck
+from generator import build_valid_matrix
+from memory import MEMORY_LIMIT_ENV, parse_size
+from records import RECORD_SUFFIX, GameRecorder
+from solver import SolverEngine, STRATEGIES
+
+ELO_START = 1500.0
+ELO_K = 16.0
+
+
+@dataclass
+class GameResult:
+    seed: int
+    strategies: Tuple[str, str]
+    winner: int
+    moves: int
+    latencies: Dict[int, List[float]] = field(default_factory=dict)
+    nodes: Dict[int, List[int]] = field(default_factory=dict)
+    peaks: Dict[int, List[int]] = field(default_factory=dict)
+
+
+def play_game(matrix: List[List[int]], strategies: Tuple[str, str], seed: int = 0,
+              time_budget: float = 1.0, recorder: Optional[GameRecorder] = None) -> GameResult:
+    board = DominosaBoard(matrix)
+    engines = {1: SolverEngine(board.fork(), time_budget), 2: SolverEngine(board.fork(), time_budget)}
+    names = {1: strategies[0], 2: strategies[1]}
+    result = GameResult(seed, tuple(strategies), 0, 0, {1: [], 2: []}, {1: [], 2: []}, {1: [], 2: []})
+
+    current_turn = 1
+    while True:
+        engine = engines[current_turn]
+        start = time.perf_counter()
+        move, _ = engine.solve_next_step(names[current_turn], board.snapshot())
+        result.latencies[current_turn].append(time.perf_counter() - start)
+        result.nodes[current_turn].append(engine.stats.nodes_expanded)
+        result.peaks[current_turn].append(engine.stats.memory_peak)
+
+        if not move:
+            result.winner = 2 if current_turn == 1 else 1
+            return result
+
+        board.confirm_edge(board.edges[move.index], current_turn)
+        if recorder is not None:
+            recorder.record(move.index, current_turn)
+        result.moves += 1
+        if not board.has_valid_moves():
+            result.winner = winner_when_stuck(current_turn)
+            return result
+        current_turn = 1 if current_turn == 2 else 2
+
+
+def _play_seeded(size: int, strategies: Tuple[str, str], seed: int, time_budget: float,
+                 record_dir: Optional[str] = None) -> GameResult:
+    matrix = build_valid_matrix(size, random.Random(seed))
+    if record_dir is None:
+        return play_game(matrix, strategies, seed, time_budget)
+    path = os.path.join(record_dir, f"d{size}-{seed}-{strategies[0]}-{strategies[1]}{RECORD_SUFFIX}")
+    with GameRecorder.open(path, matrix, seed, strategies, time_budget) as recorder:
+        return play_game(matrix, strategies, seed, time_budget, recorder)
+
+
+def schedule(strategies: Sequence[str], games_per_pair: int, seed: int) -> List[Tuple[Tuple[str, str], int]]:
+    jobs = []
+    for p, (a, b) in enumerate(itertools.combinations(strategies, 2)):
+        for g in range(games_per_pair):
+            # Consecutive games replay the same board with the seats swapped.
+            board_seed = seed + p * 100003 + g // 2
+            jobs.append(((a, b) if g % 2 == 0 else (b, a), board_seed))
+    return jobs
+
+
+def percentile(values: List[float], p: float) -> float:
+    if not values: return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+
+def elo_ratings(results: List[GameResult]) -> Dict[str, float]:
+    ratings: Dict[str, float] = {}
+    for res in results:
+        a, b = res.strategies
+        ra, rb = ratings.setdefault(a, ELO_START), ratings.setdefault(b, ELO_START)
+        expected_a = 1.0 / (1.0 + 10 ** ((rb - ra) / 400.0))
+        score_a = 1.0 if res.winner == 1 else 0.0
+        ratings[a] = ra + ELO_K * (score_a - expected_a)
+        ratings[b] = rb - ELO_K * (score_a - expected_a)
+    return ratings
+
+
+def summarize(results: List[GameResult]) -> Dict:
+    per_strategy: Dict[str, Dict] = {}
+    pairings: Dict[str, Dict[str, int]] = {}
+    for res in results:
+        for seat in (1, 2):
+            name = res.strategies[seat - 1]
+            entry = per_strategy.setdefault(name, {"games": 0, "wins": 0, "latencies": [], "nodes": [],
+                                                       "peaks": []})
+            entry["games"] += 1
+            entry["wins"] += res.winner == seat
+            entry["latencies"].extend(res.latencies[seat])
+            entry["nodes"].extend(res.nodes[seat])
+            entry["peaks"].extend(res.peaks[seat])
+        key = " vs ".join(sorted(res.strategies))
+        tally = pairings.setdefault(key, {name: 0 for name in sorted(res.strategies)})
+        tally[res.strategies[res.winner - 1]] += 1
+
+    ratings = elo_ratings(results)
+    table = {}
+    for name, entry in per_strategy.items():
+        lat, nodes = entry["latencies"], entry["nodes"]
+        table[name] = {
+            "games": entry["games"],
+            "win_rate": entry["wins"] / entry["games"],
+            "elo": round(ratings.get(name, ELO_START), 1),
+            "latency_ms": {f"p{int(p * 100)}": round(percentile(lat, p) * 1000, 3) for p in (0.5, 0.9, 0.99)},
+            "nodes_per_move": round(sum(nodes) / len(nodes), 1) if nodes else 0.0,
+            "peak_kb": round(max(entry["peaks"], default=0) / 1024, 1),
+        }
+    return {"games": len(results), "strategies": table, "pairings": pairings}
+
+
+def run_tournament(strategies: Sequence[str], games_per_pair: int = 10, size: int = 4, seed: int = 0,
+                   workers: Optional[int] = None, time_budget: float = 1.0,
+                   record_dir: Optional[str] = None) -> Tuple[Dict, List[GameResult]]:
+    for name in strategies:
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{name}'")
+
+    jobs = schedule(strategies, games_per_pair, seed)
+    if record_dir:
+        os.makedirs(record_dir, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+        futures = [pool.submit(_play_seeded, size, pairing, board_seed, time_budget, record_dir)
+                   for pairing, board_seed in jobs]
+        results = [f.result() for f in futures]
+    return summarize(results), results
+
+
+def _print_report(report: Dict):
+    print(f"{report['games']} games")
+    header = f"{'STRATEGY':<22}{'GAMES':>7}{'WIN%':>8}{'ELO':>9}{'P50 ms':>10}{'P90 ms':>10}{'P99 ms':>10}{'NODES/MV':>11}{'PEAK KB':>10}"
+    print(header)
+    ranked = sorted(report["strategies"].items(), key=lambda kv: -kv[1]["elo"])
+    for name, row in ranked:
+        lat = row["latency_ms"]
+        print(f"{name:<22}{row['games']:>7}{row['win_rate'] * 100:>7.1f}%{row['elo']:>9.1f}"
+              f"{lat['p50']:>10.2f}{lat['p90']:>10.2f}{lat['p99']:>10.2f}{row['nodes_per_move']:>11.1f}"
+              f"{row['peak_kb']:>10.1f}")
+    for pairing, tally in sorted(report["pairings"].items()):
+        print(f"  {pairing}: " + ", ".join(f"{k} {v}" for k, v in tally.items()))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Headless strategy-vs-strategy Dominosa tournament")
+    parser.add_argument("--strategies", nargs="+", default=[s for s in STRATEGIES if s != "PORTFOLIO"])
+    parser.add_argument("--games", type=int, default=10, help="games per strategy pairing")
+    parser.add_argument("--size", type=int, default=4, help="Double-N board size")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--time-budget", type=float, default=1.0, help="per-move budget for ADVERSARIAL")
+    parser.add_argument("--json", help="also write the full report and game list to this file")
+    parser.add_argument("--record-dir", help="write a binary game record per game into this directory")
+    parser.add_argument("--memory-limit", type=parse_size, help="per-engine memory budget, e.g. 512M")
+    args = parser.parse_args()
+    if args.memory_limit:
+        # Worker processes build their engines from the environment.
+        os.environ[MEMORY_LIMIT_ENV] = str(args.memory_limit)
+
+    report, games = run_tournament(args.strategies, args.games, args.size, args.seed,
+                                   args.workers, args.time_budget, args.record_dir)
+    _print_report(report)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump({"report": report, "games": [asdict(g) for g in games]}, fh, indent=2)
@@ -0,0 +1,163 @@
+import hashlib
+import os
+import struct
+import threading
+from typing import Dict, Iterable, Optional, Tuple
+
+# Version 1 stores could hold "unsolvable" verdicts recorded by searches that
+# were cut short, so they are ignored: neither read nor written.
+MAGIC = b"DMTT\x02"
+TT_PATH_ENV = "DOMINOSA_TT"
+KIND_VERDICT = 0
+KIND_BEST_MOVE = 1
+COMPACT_MIN_RECORDS = 4096
+
+_RECORD = struct.Struct("<16sBiH")
+
+Table = Dict[Tuple[int, int], int]
+
+
+def board_fingerprint(matrix: Iterable[Iterable[int]]) -> bytes:
+    flat = ";".join(",".join(str(v) for v in row) for row in matrix)
+    return hashlib.blake2b(flat.encode(), digest_size=16).digest()
+
+
+def _pack(fingerprint: bytes, kind: int, key: int, value: int) -> bytes:
+    raw = key.to_bytes((key.bit_length() + 7) // 8, "little")
+    return _RECORD.pack(fingerprint, kind, value, len(raw)) + raw
+
+
+class TTStore:
+    # Append-only log of (board fingerprint, kind, state key) -> value records.
+    # The file is only read on the first lookup, later records override earlier
+    # ones, and a background thread rewrites it once most records are stale.
+    # One writing process per file is assumed.
+    def __init__(self, path: str):
+        self.path = path
+        self.stale = False
+        self.lock = threading.RLock()
+        self.tables: Optional[Dict[bytes, Table]] = None
+        self.records = 0
+        self.pending: list = []
+        self.compactor: Optional[threading.Thread] = None
+        self.written_during_compaction: Optional[list] = None
+
+    def _load(self):
+        self.tables = {}
+        self.records = 0
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as fh:
+            data = fh.read()
+        if data[:len(MAGIC) - 1] == MAGIC[:-1] and not data.startswith(MAGIC):
+            self.stale = True
+            return
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{self.path} is not a solver cache file")
+
+        pos, end = len(MAGIC), len(data)
+        while pos + _RECORD.size <= end:
+            fingerprint, kind, value, length = _RECORD.unpack_from(data, pos)
+            if pos + _RECORD.size + length > end:
+                break
+            key = int.from_bytes(data[pos + _RECORD.size:pos + _RECORD.size + length], "little")
+            self.tables.setdefault(fingerprint, {})[(kind, key)] = value
+            self.records += 1
+            pos += _RECORD.size + length
+
+    def table(self, fingerprint: bytes) -> Table:
+        with self.lock:
+            if self.tables is None:
+                self._load()
+            return dict(self.tables.get(fingerprint, {}))
+
+    def live_records(self) -> int:
+        with self.lock:
+            if self.tables is None:
+                self._load()
+            return sum(len(t) for t in self.tables.values())
+
+    def put(self, fingerprint: bytes, kind: int, key: int, value: int):
+        with self.lock:
+            if self.tables is None:
+                self._load()
+            table = self.tables.setdefault(fingerprint, {})
+            if table.get((kind, key)) == value:
+                return
+            table[(kind, key)] = value
+            self.pending.append(_pack(fingerprint, kind, key, value))
+
+    def put_many(self, fingerprint: bytes, kind: int, entries: Dict[int, int]):
+        with self.lock:
+            if self.tables is None:
+                self._load()
+            table = self.tables.setdefault(fingerprint, {})
+            for key, value in entries.items():
+                if table.get((kind, key)) != value:
+                    table[(kind, key)] = value
+                    self.pending.append(_pack(fingerprint, kind, key, value))
+
+    def flush(self):
+        with self.lock:
+            if self.stale:
+                self.pending = []
+            if not self.pending:
+                return
+            fresh = not os.path.exists(self.path)
+            with open(self.path, "ab") as fh:
+                if fresh:
+                    fh.write(MAGIC)
+                fh.write(b"".join(self.pending))
+            if self.written_during_compaction is not None:
+                self.written_during_compaction.extend(self.pending)
+            self.records += len(self.pending)
+            self.pending = []
+            stale = self.records - sum(len(t) for t in self.tables.values())
+        if self.records >= COMPACT_MIN_RECORDS and stale * 2 > self.records:
+            self.compact_async()
+
+    def compact(self):
+        with self.lock:
+            if self.tables is None:
+                self._load()
+            if self.stale:
+                return
+            snapshot = [(fp, dict(table)) for fp, table in self.tables.items()]
+            self.written_during_compaction = []
+
+        tmp = self.path + ".compact"
+        try:
+            with open(tmp, "wb") as fh:
+                fh.write(MAGIC)
+                for fingerprint, table in snapshot:
+                    fh.write(b"".join(_pack(fingerprint, kind, key, value)
+                                      for (kind, key), value in table.items()))
+            with self.lock:
+                # Records flushed while the snapshot was written go after it.
+                with open(tmp, "ab") as fh:
+                    fh.write(b"".join(self.written_during_compaction))
+                os.replace(tmp, self.path)
+                self.records = sum(len(t) for _, t in snapshot) + len(self.written_during_compaction)
+        finally:
+            with self.lock:
+                self.written_during_compaction = None
+            if os.path.exists(tmp):
+                os.remove(tmp)
+
+    def compact_async(self) -> threading.Thread:
+        with self.lock:
+            if self.compactor is None or not self.compactor.is_alive():
+                self.compactor = threading.Thread(target=self.compact, daemon=True)
+                self.compactor.start()
+            return self.compactor
+
+    def close(self):
+        self.flush()
+        if self.compactor is not None:
+            self.compactor.join()
+
+
+def open_default() -> Optional[TTStore]:
+    # The cache is opt-in: it is only used when DOMINOSA_TT names a file.
+    path = os.environ.get(TT_PATH_ENV)
+    return TTStore(path) if path else None